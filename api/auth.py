@@ -1,25 +1,65 @@
+import logging
+import os
+import time
+
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from database.mongo import users_collection
-from auth.utils import hash_password, verify_password, create_access_token, decode_token
+from auth.utils import (
+    hash_password_async, verify_password_async, password_needs_rehash, create_access_token, decode_token,
+)
+from api.cache import ReadCache, MISSING
 from fastapi.security import OAuth2PasswordBearer
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Resolved users are cached per token until it expires, re-checked against Mongo at least this often
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+auth_cache = ReadCache(max_entries=int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000")), max_bytes=8 * 1024 * 1024)
+
 class UserIn(BaseModel):
     email: str
     password: str
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Resolves a bearer token to its user, caching the result until the token expires.
+
+    Returns:
+        dict: The user's "id" and "email".
+
+    Raises:
+        HTTPException: 401 if the token is invalid, expired or its user no longer exists.
+    """
+    key = ("token", token)
+    cached = auth_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    payload = decode_token(token)
+    if not payload or not ObjectId.is_valid(payload.get("sub") or ""):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = await users_collection.find_one({"_id": ObjectId(payload["sub"])}, {"email": 1})
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    resolved = {"id": str(user["_id"]), "email": user["email"]}
+    ttl = min(AUTH_USER_CACHE_TTL, payload.get("exp", 0) - time.time())
+    auth_cache.set(key, resolved, ttl)
+    return resolved
+
 @router.post("/auth/signup")
 async def signup(user: UserIn):
     if users_collection is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
     if await users_collection.find_one({"email": user.email}):
         raise HTTPException(status_code=400, detail="Email already exists")
-    hashed = hash_password(user.password)
+    hashed = await hash_password_async(user.password)
     await users_collection.insert_one({"email": user.email, "password": hashed})
     return {"msg": "User created"}
 
@@ -28,17 +68,18 @@ async def login(user: UserIn):
     if users_collection is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
     db_user = await users_collection.find_one({"email": user.email})
-    if not db_user or not verify_password(user.password, db_user["password"]):
+    if not db_user or not await verify_password_async(user.password, db_user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if password_needs_rehash(db_user["password"]):
+        # BCRYPT_ROUNDS changed since this hash was made; store it at the current cost
+        try:
+            rehashed = await hash_password_async(user.password)
+            await users_collection.update_one({"_id": db_user["_id"]}, {"$set": {"password": rehashed}})
+        except Exception:
+            logger.exception(f"Could not upgrade password hash for {user.email}")
     token = create_access_token({"sub": str(db_user["_id"])})
     return {"access_token": token, "token_type": "bearer"}
 
 @router.get("/auth/me")
-async def get_me(token: str = Depends(oauth2_scheme)):
-    payload = decode_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    user = await users_collection.find_one({"_id": ObjectId(payload.get("sub"))})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return {"email": user["email"]}
+async def get_me(current_user: dict = Depends(get_current_user)):
+    return {"email": current_user["email"]}
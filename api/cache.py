@@ -0,0 +1,130 @@
+# cache.py (in-process read cache for profile/filter/list routes)
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+FILTER_CACHE_TTL = float(os.getenv("FILTER_CACHE_TTL", "60"))
+LIST_CACHE_TTL = float(os.getenv("LIST_CACHE_TTL", "60"))
+
+# Namespaces whose entries depend on many creators at once
+QUERY_NAMESPACES = ("filter", "list", "growth", "distribution")
+
+MISSING = object()
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def make_key(namespace: str, **params) -> Tuple:
+    """
+    Cache key for a route: its namespace plus the non-empty parameters in a stable order.
+    """
+    return (namespace,) + tuple(sorted((k, _normalize(v)) for k, v in params.items() if v is not None))
+
+
+def _estimate_size(value: Any) -> int:
+    return len(json.dumps(value, default=str, separators=(",", ":")))
+
+
+class ReadCache:
+    """
+    LRU cache bounded by entry count and approximate JSON size, with a TTL per entry.
+
+    Profile entries are dropped when their username is written; filter/list
+    entries are dropped on any creator write, since a new or changed profile
+    can move in or out of any result set.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Tuple, value: Any, ttl: float):
+        if ttl <= 0:
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: Tuple):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate_usernames(self, usernames: Iterable[str]):
+        """Drops cached profiles for `usernames` and every query result."""
+        dropped = 0
+        for username in usernames:
+            key = make_key("profile", username=username)
+            if key in self._entries:
+                self._drop(key)
+                dropped += 1
+        for key in [k for k in self._entries if k[0] in QUERY_NAMESPACES]:
+            self._drop(key)
+            dropped += 1
+        self.invalidations += dropped
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared instance
+read_cache = ReadCache()
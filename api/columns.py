@@ -0,0 +1,20 @@
+# columns.py (upload/export column map, kept free of pandas so routes can import it cheaply)
+SUPPORTED_EXTENSIONS = (".xlsx", ".csv", ".parquet")
+
+# Only the username is mandatory; every other known column is copied when present
+REQUIRED_COLUMNS = ["username"]
+COUNT_COLUMNS = {
+    "followers": "follower_count",
+    "avg reel views": "avg_reel_views",
+    "avg story views": "avg_story_views",
+    "price for reel+ story (inr)": "price_reel_story",
+    "price of 2 story": "price_2_story",
+}
+TEXT_COLUMNS = {
+    "profile_link": "profile_url",
+    "insights": "insights",
+}
+
+
+def is_supported_upload(filename: str) -> bool:
+    return bool(filename) and filename.lower().endswith(SUPPORTED_EXTENSIONS)
@@ -1,16 +1,33 @@
 from fastapi import APIRouter, HTTPException, Query, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from database.mongo import creators_collection
-from scraper.worker import scrape_profile
+from database.indexes import SORTABLE_FIELDS
+from database.search import tokenize
+from database.freshness import fresh_filter, as_utc
+from database.history import record_history, creator_growth, top_growers, GROWTH_SORTS
+from database.distribution import creator_distribution
+from scraper.scheduler import scrape_scheduler, normalize_username, PRIORITY_INTERACTIVE
+from scraper.sessions import session_pool
+from scraper.worker import (
+    ScrapeFailed, ProfileUnavailable, FAILURE_RATE_LIMITED, FAILURE_AUTH_EXPIRED, FAILURE_CIRCUIT_OPEN,
+)
+from api.jobs import job_runner
+from api.refresher import creator_refresher
+from api.cache import read_cache, make_key, MISSING, PROFILE_CACHE_TTL, FILTER_CACHE_TTL, LIST_CACHE_TTL
+from api.responses import FastJSONResponse, stream_cursor, STREAM_THRESHOLD, RESPONSE_FORMATS
+from api.export import EXPORTERS, EXPORT_FORMATS, EXPORT_PROJECTION
+from api.pagination import encode_cursor, decode_cursor, keyset_filter, InvalidCursor
+# api.ingest (pandas/numpy) is imported by the upload route on first use
+from api.columns import REQUIRED_COLUMNS, SUPPORTED_EXTENSIONS, is_supported_upload
 from datetime import datetime, timezone
 from typing import Optional, List
-from io import BytesIO
 from bson import ObjectId
-import pandas as pd
+from pymongo import ASCENDING, DESCENDING
 import traceback
+import math
+import time
 import logging
-import re
 import asyncio
 from session_manager import refresh_instagram_session
 
@@ -18,31 +35,65 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # === Filter Creators ===
+def creator_filter(
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    location_tokens: Optional[List[str]] = None,
+    min_engagement: Optional[float] = None,
+    account_type: Optional[str] = None,
+    last_scraped_before: Optional[datetime] = None,
+) -> dict:
+    """Mongo query shared by filter_creators, export_creators and get_distribution."""
+    query = {}
+    followers = {}
+    if min_followers is not None:
+        followers["$gte"] = min_followers
+    if max_followers is not None:
+        followers["$lte"] = max_followers
+    if followers:
+        query["follower_count"] = followers
+    if location_tokens:
+        query["location_tokens"] = {"$all": location_tokens}
+    if min_engagement is not None:
+        query["engagement_rate"] = {"$gte": min_engagement}
+    if account_type:
+        query["account_type"] = account_type
+    if last_scraped_before:
+        query["scraped_at"] = {"$lt": as_utc(last_scraped_before)}
+    return query
+
 @router.get("/", response_model=List[dict])
 async def filter_creators(
     min_followers: int = Query(1000),
     max_followers: int = Query(100000),
     location: Optional[str] = None,
-    min_engagement: Optional[float] = None,
+    min_engagement: Optional[float] = Query(None, description="Minimum engagement rate, in % of followers"),
     account_type: Optional[str] = None,
     last_scraped_before: Optional[datetime] = None,
-    limit: int = Query(50)
+    limit: int = Query(50),
+    format: str = Query("json", description="json, or ndjson to stream one creator per line")
 ):
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(RESPONSE_FORMATS)}")
+    # Large or NDJSON results are streamed straight from the cursor and never cached
+    streaming = format == "ndjson" or limit > STREAM_THRESHOLD
+    tokens = tokenize(location) if location else []
+    account_type = account_type.capitalize() if account_type else None
+    cache_key = make_key(
+        "filter",
+        min_followers=min_followers, max_followers=max_followers, location=tokens,
+        min_engagement=min_engagement, account_type=account_type,
+        last_scraped_before=as_utc(last_scraped_before) if last_scraped_before else None,
+        limit=limit
+    )
+    cached = read_cache.get(cache_key) if not streaming else MISSING
+    if cached is not MISSING:
+        return FastJSONResponse(cached)
+
     try:
-        query = {
-            "follower_count": {"$gte": min_followers, "$lte": max_followers}
-        }
-        if location:
-            query["$or"] = [
-                {"bio": {"$regex": location, "$options": "i"}},
-                {"location": {"$regex": location, "$options": "i"}}
-            ]
-        if min_engagement is not None:
-            query["engagement_rate"] = {"$gte": min_engagement}
-        if account_type:
-            query["account_type"] = account_type.capitalize()
-        if last_scraped_before:
-            query["scraped_at"] = {"$lt": last_scraped_before.isoformat()}
+        query = creator_filter(
+            min_followers, max_followers, tokens, min_engagement, account_type, last_scraped_before
+        )
 
         projection = {
             "_id": 0,
@@ -51,13 +102,20 @@ async def filter_creators(
             "account_type": 1,
             "follower_count": 1,
             "engagement_rate": 1,
+            "avg_likes": 1,
+            "avg_comments": 1,
+            "posts_per_week": 1,
             "location": 1,
             "profile_url": 1,
             "scraped_at": 1
         }
 
-        results = creators_collection.find(query, projection).limit(limit)
-        return list(results)
+        cursor = creators_collection.find(query, projection).limit(limit)
+        if streaming:
+            return stream_cursor(cursor, format, label="filtered creators")
+        results = await cursor.to_list(length=limit)
+        read_cache.set(cache_key, results, FILTER_CACHE_TTL)
+        return FastJSONResponse(results)
 
     except Exception:
         logger.exception("Error filtering creators")
@@ -70,6 +128,38 @@ async def filter_creators(
             }
         )
 
+# === Export Creators (CSV / XLSX / Parquet) ===
+@router.get("/export")
+async def export_creators(
+    format: str = Query("csv", description="csv, xlsx or parquet"),
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    location: Optional[str] = None,
+    min_engagement: Optional[float] = None,
+    account_type: Optional[str] = None,
+    last_scraped_before: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1)
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    query = creator_filter(
+        min_followers, max_followers,
+        tokenize(location) if location else None,
+        min_engagement,
+        account_type.capitalize() if account_type else None,
+        last_scraped_before,
+    )
+    # Columns match the upload format, so an export can be edited and uploaded again
+    cursor = creators_collection.find(query, EXPORT_PROJECTION).sort("username", ASCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    filename = f"creators-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        EXPORTERS[format](cursor),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 @router.post("/refresh-session")
 async def refresh_session_route(
     username: str = Query(...),
@@ -80,6 +170,31 @@ async def refresh_session_route(
         return {"message": "Session refreshed", "sessionid": sessionid}
     raise HTTPException(status_code=500, detail="Failed to refresh session")
 
+# === Session Pool ===
+@router.get("/sessions/stats")
+async def session_stats():
+    return session_pool.stats()
+
+@router.post("/sessions/reload")
+async def reload_sessions():
+    await session_pool.reload()
+    return session_pool.stats()
+
+# === Scheduler Stats ===
+@router.get("/scheduler/stats")
+async def scheduler_stats():
+    return scrape_scheduler.stats()
+
+# === Background Refresher Stats ===
+@router.get("/refresher/stats")
+async def refresher_stats():
+    return await creator_refresher.stats()
+
+# === Read Cache Stats ===
+@router.get("/cache/stats")
+async def cache_stats():
+    return read_cache.stats()
+
 # === Scrape One Profile ===
 @router.post("/scrape/{username}", response_model=dict)
 async def scrape_creator(
@@ -88,6 +203,8 @@ async def scrape_creator(
     login_username: Optional[str] = None,
     login_password: Optional[str] = None
 ):
+    # Stored usernames are Instagram's canonical lowercase form; "/scrape/@Name" must hit the same document
+    username = normalize_username(username)
     try:
         login_credentials = None
         if use_login:
@@ -101,35 +218,56 @@ async def scrape_creator(
                 "password": login_password
             }
 
-        existing = creators_collection.find_one({"username": username}, {"scraped_at": 1})
+        existing = await creators_collection.find_one(
+            {"username": username, **fresh_filter()},
+            {"scraped_at": 1}
+        )
         if existing:
-            try:
-                last_scraped = datetime.fromisoformat(existing.get("scraped_at"))
-                if (datetime.now(timezone.utc) - last_scraped).days < 1:
-                    return {
-                        "message": f"Profile {username} was recently scraped ({last_scraped.isoformat()})",
-                        "status": "cached"
-                    }
-            except:
-                pass
-
-        result = await scrape_profile(username, login_credentials)
-        if not result:
             return {
-                "message": f"Scraping failed or returned no data for {username}",
-                "status": "failed"
+                "message": f"Profile {username} was recently scraped ({existing['scraped_at'].isoformat()})",
+                "status": "cached"
             }
 
-        creators_collection.update_one(
+        started = time.perf_counter()
+        try:
+            result = await scrape_scheduler.submit(username, login_credentials, priority=PRIORITY_INTERACTIVE)
+        except ScrapeFailed as e:
+            if isinstance(e, ProfileUnavailable):
+                status_code = 404
+            elif e.reason in (FAILURE_RATE_LIMITED, FAILURE_CIRCUIT_OPEN) or (
+                e.reason == FAILURE_AUTH_EXPIRED and e.retry_after
+            ):
+                # retry_after on auth_expired means every session is resting, not a bad login
+                status_code = 503
+            else:
+                status_code = 502
+            # Rounded up: "Retry-After: 0" would invite an immediate retry into the same wall
+            headers = {"Retry-After": str(max(1, math.ceil(e.retry_after)))} if e.retry_after else None
+            return JSONResponse(
+                status_code=status_code,
+                headers=headers,
+                content={
+                    "message": f"Scraping failed or returned no data for {username}",
+                    "status": "failed",
+                    "reason": e.reason,
+                }
+            )
+
+        await creators_collection.update_one(
             {"username": username},
             {"$set": result},
             upsert=True
         )
+        read_cache.invalidate_usernames([username])
+        try:
+            await record_history([result])
+        except Exception:
+            logger.exception(f"Could not record follower history for {username}")
 
         return {
             "message": f"Successfully scraped and saved profile: {username}",
             "source": result.get("source", "unknown"),
-            "scrape_time_seconds": result.get("scrape_time_seconds", None),
+            "scrape_time_seconds": round(time.perf_counter() - started, 3),
             "status": "success"
         }
 
@@ -145,126 +283,80 @@ async def scrape_creator(
             }
         )
 
-# === Parse Followers Text ===
-def parse_count(val):
-    if pd.isna(val):
-        return 0
-    val = str(val).lower().strip()
-    val = val.replace(",", "").replace("~", "").replace("—", "-").replace("–", "-")
-
-    if "-" in val:
-        parts = val.split("-")
-        try:
-            nums = [float(p) for p in parts if p]
-            return int(sum(nums) / len(nums)) if nums else 0
-        except:
-            return 0
-
-    match = re.match(r"([\d.]+)\s*([kmb]?)", val)
-    if match:
-        number, suffix = match.groups()
-        multipliers = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
-        return int(float(number) * multipliers.get(suffix, 1))
-
-    try:
-        return int(float(val))
-    except:
-        return 0
-
-# === Upload Excel and Scrape All ===
+# === Upload Excel/CSV/Parquet and Scrape All (background job) ===
 @router.post("/upload-excel")
 async def upload_excel(file: UploadFile = File(...)):
-    import time
-    start_time = time.time()
-
-    if not file.filename.endswith((".xlsx", ".xls")):
-        raise HTTPException(status_code=400, detail="Only Excel files are supported.")
+    if not is_supported_upload(file.filename):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Upload one of: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
 
-    content = await file.read()
+    from api.ingest import UploadReader, UnreadableUpload, iter_row_chunks
 
-    df = pd.read_excel(BytesIO(content), engine='openpyxl')
-    df.columns = [col.strip().lower() for col in df.columns]
+    reader = UploadReader(file.file, file.filename)
+    try:
+        columns = await asyncio.to_thread(reader.open)
+    except Exception as e:
+        logger.exception(f"Could not read upload {file.filename}")
+        raise HTTPException(status_code=400, detail=f"Could not read {file.filename}: {e}")
 
-    required_columns = [
-        "username", "profile_link", "followers", "insights",
-        "avg reel views", "avg story views",
-        "price for reel+ story (inr)", "price of 2 story"
-    ]
-    for col in required_columns:
-        if col not in df.columns:
+    for col in REQUIRED_COLUMNS:
+        if col not in columns:
             raise HTTPException(status_code=400, detail=f"Missing required column: {col}")
 
-    inserted_usernames = []
-    failed_usernames = []
-
-    tasks = []
-    for _, row in df.iterrows():
-        username = str(row["username"]).strip().lower()
-        existing = creators_collection.find_one({"username": username}, {"scraped_at": 1})
-        if existing:
-            try:
-                last_scraped = datetime.fromisoformat(existing["scraped_at"])
-                if (datetime.now(timezone.utc) - last_scraped).days < 1:
-                    continue
-            except:
-                pass
-        tasks.append((username, row))
-
-    async def process(username, row):
-        try:
-            logger.info(f"Scraping: {username}")
-            scraped = await scrape_profile(username)
-            if not scraped:
-                logger.warning(f"Failed to scrape {username}")
-                return (username, False)
-
-            scraped.update({
-                "profile_url": row["profile_link"],
-                "follower_count": parse_count(row["followers"]),
-                "insights": row["insights"],
-                "avg_reel_views": parse_count(row["avg reel views"]),
-                "avg_story_views": parse_count(row["avg story views"]),
-                "price_reel_story": parse_count(row["price for reel+ story (inr)"]),
-                "price_2_story": parse_count(row["price of 2 story"]),
-                "source": "excel+scraped",
-                "scraped_at": datetime.now(timezone.utc).isoformat()
-            })
-
-            creators_collection.update_one(
-                {"username": username},
-                {"$set": scraped},
-                upsert=True
-            )
-            logger.info(f"Inserted: {username}")
-            return (username, True)
-
-        except Exception as e:
-            logger.exception(f"Error processing {username}: {e}")
-            return (username, False)
-
-    results = await asyncio.gather(*[process(u, r) for u, r in tasks])
-    for username, success in results:
-        (inserted_usernames if success else failed_usernames).append(username)
-
+    try:
+        job_id, total_rows = await job_runner.create_job(file.filename, iter_row_chunks(reader))
+    except UnreadableUpload as e:
+        logger.warning(f"Upload {file.filename} failed mid-file: {e}")
+        raise HTTPException(status_code=400, detail=f"Could not read {file.filename}: {e}")
     return {
-        "message": f"{len(inserted_usernames)} profiles inserted/updated.",
-        "status": "success",
-        "inserted_usernames": inserted_usernames,
-        "failed_usernames": failed_usernames,
-        "total_time_seconds": round(time.time() - start_time, 2)
+        "message": f"Accepted {total_rows} rows for background scraping.",
+        "status": "queued",
+        "job_id": job_id,
+        "total_rows": total_rows,
+        "progress_url": f"/creators/jobs/{job_id}"
     }
 
+# === Upload Job Progress / Control ===
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    progress = await job_runner.progress(job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return progress
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    if not await job_runner.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is not running")
+    return {"job_id": job_id, "status": "cancelled"}
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
+    status = await job_runner.resume(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if status != "running":
+        raise HTTPException(status_code=409, detail=f"Job {job_id} cannot be resumed from status '{status}'")
+    return {"job_id": job_id, "status": status}
+
 # === Get Profile by Username ===
 @router.get("/profile/{username}", response_model=dict)
 async def get_creator_profile(username: str):
+    cache_key = make_key("profile", username=username)
+    cached = read_cache.get(cache_key)
+    if cached is not MISSING:
+        return FastJSONResponse(cached)
     try:
-        profile = creators_collection.find_one({"username": username}, {"_id": 0})
+        profile = await creators_collection.find_one({"username": username}, {"_id": 0})
         if not profile:
             raise HTTPException(
                 status_code=404,
                 detail=f"Profile {username} not found in database"
             )
-        return profile
+        read_cache.set(cache_key, profile, PROFILE_CACHE_TTL)
+        return FastJSONResponse(profile)
     except HTTPException:
         raise
     except Exception:
@@ -278,18 +370,182 @@ async def get_creator_profile(username: str):
             }
         )
 
-from bson import ObjectId
+# === Follower Growth ===
+@router.get("/profile/{username}/growth", response_model=dict)
+async def get_creator_growth(username: str, days: int = Query(30, ge=1, le=730)):
+    cache_key = make_key("growth", username=username, days=days)
+    cached = read_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+    try:
+        growth = await creator_growth(username, days)
+        if not growth:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No follower history for {username} in the last {days} days"
+            )
+        read_cache.set(cache_key, growth, LIST_CACHE_TTL)
+        return growth
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception(f"Error computing growth for {username}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"Internal server error while computing growth for {username}",
+                "traceback": traceback.format_exc()
+            }
+        )
+
+@router.get("/growth/top")
+async def get_top_growers(
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(50, ge=1, le=500),
+    sort_by: str = Query("delta"),
+    min_followers: int = Query(0, ge=0),
+):
+    if sort_by not in GROWTH_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(GROWTH_SORTS)}")
+    cache_key = make_key("growth", days=days, limit=limit, sort_by=sort_by, min_followers=min_followers)
+    cached = read_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+    try:
+        items = await top_growers(days, limit, sort_by, min_followers)
+        response = {"days": days, "sort_by": sort_by, "items": jsonable_encoder(items)}
+        read_cache.set(cache_key, response, LIST_CACHE_TTL)
+        return response
+    except Exception:
+        logger.exception("Error computing top growers")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "Internal server error while computing top growers",
+                "traceback": traceback.format_exc()
+            }
+        )
+
+# === Follower / Engagement Distribution ===
+@router.get("/distribution")
+async def get_distribution(
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    location: Optional[str] = None,
+    min_engagement: Optional[float] = Query(None, description="Minimum engagement rate, in % of followers"),
+    account_type: Optional[str] = None,
+    last_scraped_before: Optional[datetime] = None,
+):
+    """Follower and engagement histograms, bucketed in Mongo instead of on the client."""
+    tokens = tokenize(location) if location else []
+    account_type = account_type.capitalize() if account_type else None
+    cache_key = make_key(
+        "distribution",
+        min_followers=min_followers, max_followers=max_followers, location=tokens,
+        min_engagement=min_engagement, account_type=account_type,
+        last_scraped_before=as_utc(last_scraped_before) if last_scraped_before else None,
+    )
+    cached = read_cache.get(cache_key)
+    if cached is not MISSING:
+        return FastJSONResponse(cached)
+    try:
+        query = creator_filter(
+            min_followers, max_followers, tokens, min_engagement, account_type, last_scraped_before
+        )
+        response = await creator_distribution(query)
+        read_cache.set(cache_key, response, LIST_CACHE_TTL)
+        return FastJSONResponse(response)
+    except Exception:
+        logger.exception("Error computing creator distribution")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "Internal server error while computing the creator distribution",
+                "traceback": traceback.format_exc()
+            }
+        )
+
+# === List Creators (keyset-paginated) ===
+LIST_PROJECTION = {
+    "_id": 0,
+    "username": 1,
+    "profile_pic_url": 1,
+    "profile_url": 1,
+    "follower_count": 1,
+    "following_count": 1,
+    "avg_reel_views": 1,
+    "avg_story_views": 1,
+    "engagement_rate": 1,
+    "avg_likes": 1,
+    "avg_comments": 1,
+    "posts_per_week": 1,
+}
 
 @router.get("/all")  # becomes /creators/all via prefix
-async def get_all_creators():
+async def get_all_creators(
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    min_reel_views: Optional[int] = None,
+    min_story_views: Optional[int] = None,
+    sort_by: str = Query("follower_count"),
+    order: str = Query("desc"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
+):
+    if sort_by not in SORTABLE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(SORTABLE_FIELDS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
     try:
-        # Use async to_list to fetch all documents
-        docs = await creators_collection.find().to_list(length=None)
-        creators = []
-        for doc in docs:
-            doc.pop("_id", None)  # Remove ObjectId
-            creators.append(doc)
-        return creators
+        position = decode_cursor(cursor, sort_by, order) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cache_key = make_key(
+        "list",
+        min_followers=min_followers, max_followers=max_followers,
+        min_reel_views=min_reel_views, min_story_views=min_story_views,
+        sort_by=sort_by, order=order, limit=limit, cursor=cursor
+    )
+    cached = read_cache.get(cache_key)
+    if cached is not MISSING:
+        return FastJSONResponse(cached)
+
+    try:
+        clauses = []
+        followers = {}
+        if min_followers is not None:
+            followers["$gte"] = min_followers
+        if max_followers is not None:
+            followers["$lte"] = max_followers
+        if followers:
+            clauses.append({"follower_count": followers})
+        if min_reel_views is not None:
+            clauses.append({"avg_reel_views": {"$gte": min_reel_views}})
+        if min_story_views is not None:
+            clauses.append({"avg_story_views": {"$gte": min_story_views}})
+        after = keyset_filter(sort_by, order, position)
+        if after:
+            clauses.append(after)
+        query = {"$and": clauses} if clauses else {}
+
+        direction = DESCENDING if order == "desc" else ASCENDING
+        docs = await creators_collection.find(query, LIST_PROJECTION) \
+            .sort([(sort_by, direction), ("username", direction)]) \
+            .limit(limit + 1) \
+            .to_list(length=limit + 1)
+
+        has_more = len(docs) > limit
+        items = docs[:limit]
+        page = {
+            "items": items,
+            "next_cursor": encode_cursor(sort_by, order, items[-1]) if has_more else None
+        }
+        read_cache.set(cache_key, page, LIST_CACHE_TTL)
+        return FastJSONResponse(page)
     except Exception:
         logger.exception("Error fetching all creators")
         return JSONResponse(
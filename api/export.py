@@ -0,0 +1,157 @@
+# export.py (streaming writers for /creators/export, mirroring the upload columns)
+import asyncio
+import csv
+import io
+import os
+import tempfile
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from api.columns import COUNT_COLUMNS, TEXT_COLUMNS
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+# In-memory spool for XLSX before it spills to disk
+_XLSX_SPOOL_BYTES = 8 * 1024 * 1024
+
+# (header, creator field) in upload order, so an export can be uploaded again as-is
+EXPORT_COLUMNS: List[Tuple[str, str]] = (
+    [("username", "username")]
+    + list(COUNT_COLUMNS.items())
+    + list(TEXT_COLUMNS.items())
+)
+EXPORT_PROJECTION = {"_id": 0, **{field: 1 for _, field in EXPORT_COLUMNS}}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _count(value: Any):
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    return None
+
+
+def _text(value: Any):
+    return None if value is None else str(value)
+
+
+def _rows(docs: List[Dict[str, Any]]) -> List[list]:
+    count_fields = set(COUNT_COLUMNS.values())
+    return [
+        [(_count if field in count_fields else _text)(doc.get(field)) for _, field in EXPORT_COLUMNS]
+        for doc in docs
+    ]
+
+
+async def _chunks(cursor, size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    chunk = []
+    async for doc in cursor.batch_size(size):
+        chunk.append(doc)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def export_csv(cursor) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    async for chunk in _chunks(cursor):
+        writer.writerows(_rows(chunk))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose bytes are handed out and forgotten as they are produced."""
+
+    def __init__(self):
+        self._pending = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        self._pending.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._pending = bytes(self._pending), bytearray()
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+    count_fields = set(COUNT_COLUMNS.values())
+    return pa.schema([
+        (header, pa.int64() if field in count_fields else pa.string())
+        for header, field in EXPORT_COLUMNS
+    ])
+
+
+async def export_parquet(cursor) -> AsyncIterator[bytes]:
+    """One row group per chunk; bytes are yielded as each row group is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for chunk in _chunks(cursor):
+            rows = _rows(chunk)
+            columns = [[row[i] for row in rows] for i in range(len(EXPORT_COLUMNS))]
+            table = pa.Table.from_arrays(
+                [pa.array(values, type=schema.field(i).type) for i, values in enumerate(columns)],
+                schema=schema,
+            )
+            await asyncio.to_thread(writer.write_table, table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def export_xlsx(cursor) -> AsyncIterator[bytes]:
+    """
+    XLSX is a zip whose directory is written last, so the workbook is built in
+    openpyxl's write-only mode into a spooled temp file and streamed afterwards.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("creators")
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    async for chunk in _chunks(cursor):
+        for row in _rows(chunk):
+            sheet.append(row)
+
+    with tempfile.SpooledTemporaryFile(max_size=_XLSX_SPOOL_BYTES) as spool:
+        await asyncio.to_thread(workbook.save, spool)
+        spool.seek(0)
+        while True:
+            data = await asyncio.to_thread(spool.read, 1024 * 1024)
+            if not data:
+                break
+            yield data
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "xlsx": export_xlsx,
+    "parquet": export_parquet,
+}
@@ -0,0 +1,268 @@
+# ingest.py (streaming reader for creator spreadsheets)
+import asyncio
+import importlib.util
+import os
+import re
+from typing import Optional, List, Dict, Any, Iterator, AsyncIterator
+
+import numpy as np
+import pandas as pd
+
+from api.columns import COUNT_COLUMNS, TEXT_COLUMNS, is_supported_upload
+
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "5000"))
+
+# Arrow-backed strings run the regex/replace passes below in native code
+_STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+
+_MULTIPLIERS = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+_COUNT_RE = r"^([\d.]+)\s*([kmb]?).*$"
+# Counts are stored as int64; anything past it is not a real count and reads as 0
+_INT64_LIMIT = 2 ** 63
+
+
+def _bounded(count: int) -> int:
+    return count if -_INT64_LIMIT <= count < _INT64_LIMIT else 0
+
+
+# === Parse Followers Text ===
+def parse_count(val):
+    if pd.isna(val):
+        return 0
+    val = str(val).lower().strip()
+    val = val.replace(",", "").replace("~", "").replace("—", "-").replace("–", "-")
+
+    if "-" in val:
+        parts = val.split("-")
+        try:
+            nums = [float(p) for p in parts if p]
+            return _bounded(int(sum(nums) / len(nums))) if nums else 0
+        except:
+            return 0
+
+    match = re.match(r"([\d.]+)\s*([kmb]?)", val)
+    if match:
+        number, suffix = match.groups()
+        multipliers = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+        return _bounded(int(float(number) * multipliers.get(suffix, 1)))
+
+    try:
+        return _bounded(int(float(val)))
+    except:
+        return 0
+
+
+def _parse_count_safe(val):
+    try:
+        return parse_count(val)
+    except ValueError:
+        # e.g. "1.2.3k": parse_count raises here, a bulk import should not
+        return 0
+
+
+def parse_count_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_count over a whole column.
+
+    Each distinct value is parsed once (sheets repeat "10k", "1.2M", ... a lot).
+    Plain counts ("1200", "1.2k", "3 M", 4500.0) and ranges ("10-20") are handled
+    with string ops; the rare value neither path can read falls back to
+    parse_count, so the results are identical.
+
+    Args:
+        series (pd.Series): Raw column values.
+
+    Returns:
+        pd.Series: int64 counts (0 for missing values), aligned to the input index.
+    """
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+    parsed = _parse_distinct_counts(pd.Series(uniques, dtype=object)).to_numpy()
+    counts = np.zeros(len(codes), dtype="int64")
+    present = codes >= 0
+    counts[present] = parsed[codes[present]]
+    return pd.Series(counts, index=series.index)
+
+
+def _parse_distinct_counts(values: pd.Series) -> pd.Series:
+    result = pd.Series(0, index=values.index, dtype="int64")
+    present = values.notna()
+    if not present.any():
+        return result
+
+    text = (
+        values[present].astype(str).astype(_STRING_DTYPE).str.lower().str.strip()
+        .str.replace(",", "", regex=False).str.replace("~", "", regex=False)
+        .str.replace("—", "-", regex=False).str.replace("–", "-", regex=False)
+    )
+    is_range = text.str.contains("-", regex=False)
+
+    # "a-b-c": average of the numeric parts, 0 if any part isn't a plain number
+    ranges = text[is_range]
+    if len(ranges):
+        parts = ranges.str.split("-").explode()
+        parts = parts[parts != ""]
+        numbers = pd.to_numeric(parts, errors="coerce")
+        grouped = numbers.groupby(level=0)
+        averages = (grouped.sum() / grouped.count()).where(~numbers.isna().groupby(level=0).any(), 0)
+        # Also catches inf; casting anything past int64 would wrap around
+        averages = averages.where(averages.abs() < _INT64_LIMIT, 0)
+        result.loc[averages.index] = averages.astype("int64")
+
+    # "1.2k", "350", "3 m followers": leading number plus optional k/m/b suffix
+    plain = text[~is_range]
+    matched = plain.str.match(_COUNT_RE)
+    numbers = plain.str.replace(_COUNT_RE, r"\1", regex=True)
+    suffixes = plain.str.replace(_COUNT_RE, r"\2", regex=True)
+    fast = matched & numbers.str.fullmatch(r"\d+\.?\d*|\.\d+")
+    fast = fast.fillna(False).astype(bool)
+    counts = numbers[fast].astype("float64") * suffixes[fast].map(_MULTIPLIERS).fillna(1).astype("float64")
+    counts = counts.where(counts < _INT64_LIMIT, 0)
+    result.loc[counts.index] = counts.astype("int64")
+
+    slow_index = fast[~fast].index
+    if len(slow_index):
+        result.loc[slow_index] = values.loc[slow_index].map(_parse_count_safe).astype("int64")
+    return result
+
+
+def normalize_columns(columns) -> List[str]:
+    return ["" if col is None else str(col).strip().lower() for col in columns]
+
+
+class UnreadableUpload(ValueError):
+    """A chunk past the header could not be parsed (malformed row, truncated file, ...)."""
+
+
+class UploadReader:
+    """
+    Reads an uploaded sheet in row chunks without loading it whole.
+
+    .xlsx is read with openpyxl in read-only mode, .csv with pandas' chunked
+    reader and .parquet by record batch, so memory stays flat with file size.
+    """
+
+    def __init__(self, fileobj, filename: str, chunk_size: int = INGEST_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.filename = filename
+        self.chunk_size = max(1, chunk_size)
+        self.columns: List[str] = []
+        self._frames: Optional[Iterator[pd.DataFrame]] = None
+
+    @staticmethod
+    def is_supported(filename: str) -> bool:
+        return is_supported_upload(filename)
+
+    def open(self) -> List[str]:
+        """
+        Reads the header and prepares chunk iteration.
+
+        Returns:
+            list: Normalized column names.
+        """
+        name = self.filename.lower()
+        if name.endswith(".csv"):
+            self._frames = self._csv_frames()
+        elif name.endswith(".parquet"):
+            self._frames = self._parquet_frames()
+        else:
+            self._frames = self._xlsx_frames()
+        # Each generator sets self.columns before its first yield
+        first = next(self._frames, None)
+        if first is not None:
+            self._frames = _prepend(first, self._frames)
+        return self.columns
+
+    def _xlsx_frames(self) -> Iterator[pd.DataFrame]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            self.columns = normalize_columns(next(rows, ()))
+            width = len(self.columns)
+            chunk = []
+            for values in rows:
+                if values is None or all(v is None for v in values):
+                    continue
+                # Sheets without a stored dimension return rows cut at the last non-empty cell
+                chunk.append(tuple(values[:width]) + (None,) * (width - len(values)))
+                if len(chunk) >= self.chunk_size:
+                    yield pd.DataFrame(chunk, columns=self.columns, dtype=object)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=self.columns, dtype=object)
+        finally:
+            workbook.close()
+
+    def _csv_frames(self) -> Iterator[pd.DataFrame]:
+        for frame in pd.read_csv(self.fileobj, chunksize=self.chunk_size, dtype=str):
+            frame.columns = self.columns = normalize_columns(frame.columns)
+            yield frame
+
+    def _parquet_frames(self) -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet uploads require the 'pyarrow' package.")
+
+        parquet = pq.ParquetFile(self.fileobj)
+        self.columns = normalize_columns(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=self.chunk_size):
+            frame = batch.to_pandas()
+            frame.columns = self.columns
+            yield frame
+
+    def frames(self) -> Iterator[pd.DataFrame]:
+        if self._frames is None:
+            self.open()
+        return self._frames
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+def frame_to_rows(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Converts one chunk into creator row dicts (username plus the columns present).
+    """
+    frame = frame[frame["username"].notna()]
+    # Vectorized scraper.scheduler.normalize_username: sheets often write handles as "@name"
+    usernames = frame["username"].astype(str).str.strip().str.lstrip("@").str.lower()
+    frame = frame[(usernames != "").to_numpy()]
+
+    # Column-wise tolist() yields native Python values far faster than to_dict("records")
+    columns = {"username": usernames[usernames != ""].tolist()}
+    for column, field in TEXT_COLUMNS.items():
+        if column in frame.columns:
+            values = frame[column].astype(object)
+            columns[field] = values.where(values.notna(), None).tolist()
+    for column, field in COUNT_COLUMNS.items():
+        if column in frame.columns:
+            columns[field] = parse_count_series(frame[column]).tolist()
+
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+async def iter_row_chunks(reader: UploadReader) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yields row dicts chunk by chunk; parsing runs in a worker thread so the
+    event loop stays responsive during large imports.
+    """
+    frames = reader.frames()
+    while True:
+        try:
+            rows = await asyncio.to_thread(_next_rows, frames)
+        except Exception as e:
+            raise UnreadableUpload(str(e)) from e
+        if rows is None:
+            return
+        if rows:
+            yield rows
+
+
+def _next_rows(frames: Iterator[pd.DataFrame]) -> Optional[List[Dict[str, Any]]]:
+    frame = next(frames, None)
+    return None if frame is None else frame_to_rows(frame)
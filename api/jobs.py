@@ -0,0 +1,540 @@
+# jobs.py (background processing for /creators/upload-excel)
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database.mongo import creators_collection, jobs_collection, job_rows_collection, follower_history_collection
+from database.freshness import fresh_filter, as_utc
+from database.history import history_op
+from scraper.scheduler import scrape_scheduler, PRIORITY_BULK
+from scraper.worker import ScrapeFailed
+from scraper.coordination import WORKER_ID
+from api.cache import read_cache
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_ROW_INSERT_BATCH = 1000
+# Rows claimed (and freshness-checked) at a time; also bounds how long a cancel takes to reach other processes
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "200"))
+# Claims not renewed for this long belong to a dead process and return to pending
+JOB_CLAIM_TTL = float(os.getenv("JOB_CLAIM_TTL", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+BULK_WRITE_SIZE = int(os.getenv("BULK_WRITE_SIZE", "200"))
+BULK_WRITE_INTERVAL = float(os.getenv("BULK_WRITE_INTERVAL", "2"))
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+INTERRUPTED = "interrupted"
+RESUMABLE_STATES = (CANCELLED, INTERRUPTED)
+
+# Row states
+ROW_PENDING = "pending"
+ROW_CLAIMED = "claimed"
+ROW_DONE = "done"
+ROW_SKIPPED = "skipped"
+ROW_FAILED = "failed"
+ROW_COUNTERS = {ROW_DONE: "inserted", ROW_SKIPPED: "skipped", ROW_FAILED: "failed"}
+
+# failure_reason for rows that scraped fine but whose creator upsert was rejected
+FAILURE_WRITE = "write_error"
+FAILURE_INTERNAL = "internal_error"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _job_id(job_id: str) -> Optional[ObjectId]:
+    return ObjectId(job_id) if ObjectId.is_valid(job_id) else None
+
+
+class _RowResultBuffer:
+    """
+    Collects finished rows of one job and writes them in batches.
+
+    A flush happens once BULK_WRITE_SIZE rows are buffered or every BULK_WRITE_INTERVAL
+    seconds. Creator upserts go out first as one unordered bulk_write; a row is only
+    marked done (and its claim dropped) after its upsert landed, so resume never
+    skips an unsaved profile.
+    Follower-history samples of the saved profiles follow in a second bulk_write.
+    """
+
+    def __init__(self, job_oid: ObjectId, max_rows: int = BULK_WRITE_SIZE, interval: float = BULK_WRITE_INTERVAL):
+        self.job_oid = job_oid
+        self.max_rows = max(1, max_rows)
+        self.interval = interval
+        self._rows = []
+        self._lock = asyncio.Lock()
+        self._ticker: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._ticker = asyncio.create_task(self._tick())
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception(f"Periodic flush failed for job {self.job_oid}")
+
+    async def add(
+        self,
+        row_id: ObjectId,
+        status: str,
+        username: str,
+        creator_op: Optional[UpdateOne] = None,
+        reason: Optional[str] = None,
+        history: Optional[UpdateOne] = None,
+    ):
+        self._rows.append((row_id, status, username, creator_op, reason, history))
+        if len(self._rows) >= self.max_rows:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            rows, self._rows = self._rows, []
+            if not rows:
+                return
+
+            ops = [(i, row[3]) for i, row in enumerate(rows) if row[3] is not None]
+            failed_ops = set()
+            if ops:
+                try:
+                    await creators_collection.bulk_write([op for _, op in ops], ordered=False)
+                except BulkWriteError as e:
+                    failed_ops = {ops[err["index"]][0] for err in e.details.get("writeErrors", [])}
+                    logger.error(f"{len(failed_ops)} creator upserts failed for job {self.job_oid}")
+                read_cache.invalidate_usernames(
+                    rows[i][2] for i, _ in ops if i not in failed_ops
+                )
+                history = [rows[i][5] for i, _ in ops if i not in failed_ops and rows[i][5] is not None]
+                if history:
+                    try:
+                        await follower_history_collection.bulk_write(history, ordered=False)
+                    except BulkWriteError as e:
+                        logger.error(f"{len(e.details.get('writeErrors', []))} history samples failed for job {self.job_oid}")
+
+            by_outcome: Dict[Tuple[str, Optional[str]], List[ObjectId]] = {}
+            for i, (row_id, status, _, _, reason, _) in enumerate(rows):
+                if i in failed_ops:
+                    status, reason = ROW_FAILED, FAILURE_WRITE
+                by_outcome.setdefault((status, reason), []).append(row_id)
+
+            for (status, reason), ids in by_outcome.items():
+                update = {"status": status}
+                if reason:
+                    update["failure_reason"] = reason
+                await job_rows_collection.update_many(
+                    {"_id": {"$in": ids}},
+                    {"$set": update, "$unset": {"claimed_by": "", "claim_id": "", "claim_expires": ""}},
+                )
+
+            counters = {"processed": len(rows)}
+            for (status, _), ids in by_outcome.items():
+                field = ROW_COUNTERS[status]
+                counters[field] = counters.get(field, 0) + len(ids)
+            await jobs_collection.update_one({"_id": self.job_oid}, {"$inc": counters})
+            logger.info(f"Flushed {len(rows)} rows for job {self.job_oid}")
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        await self.flush()
+
+
+class ExcelJobRunner:
+    """
+    Persists upload rows as a job in Mongo and scrapes them in the background.
+
+    `job_rows` doubles as the work queue: a process claims a chunk of pending
+    rows (status "claimed", stamped with its WORKER_ID and an expiry it keeps
+    renewing), so every API process works on every running job. Claims left
+    by a process that died expire after JOB_CLAIM_TTL and go back to pending.
+    Every row keeps its own status, so cancelling or losing a process only
+    loses rows that were in flight; the last process to finish a job marks it
+    completed.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, owner: str = WORKER_ID):
+        self.workers = max(1, workers)
+        self.owner = owner
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._maintained_at = 0.0
+
+    async def create_job(self, filename: str, row_chunks: AsyncIterator[List[Dict[str, Any]]]) -> Tuple[str, int]:
+        """
+        Stores the job document and its rows chunk by chunk, then starts processing.
+
+        Args:
+            filename (str): Name of the uploaded file.
+            row_chunks (AsyncIterator): Lists of row dicts, each with at least a "username" key.
+
+        Returns:
+            tuple: The job id and the number of rows accepted.
+
+        Raises:
+            Exception: Whatever `row_chunks` or Mongo raised; the job and the rows
+            stored so far are deleted first, so no truncated job is left to resume.
+        """
+        job = {
+            "filename": filename,
+            "status": QUEUED,
+            "total": 0,
+            "processed": 0,
+            "inserted": 0,
+            "skipped": 0,
+            "failed": 0,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "active_seconds": 0.0,
+        }
+        result = await jobs_collection.insert_one(job)
+        job_id = result.inserted_id
+
+        total = 0
+        try:
+            async for rows in row_chunks:
+                for start in range(0, len(rows), JOB_ROW_INSERT_BATCH):
+                    batch = rows[start:start + JOB_ROW_INSERT_BATCH]
+                    await job_rows_collection.bulk_write(
+                        [
+                            InsertOne({
+                                "job_id": job_id,
+                                "row_index": total + offset,
+                                "username": row["username"],
+                                "fields": {k: v for k, v in row.items() if k != "username"},
+                                "status": ROW_PENDING,
+                            })
+                            for offset, row in enumerate(batch)
+                        ],
+                        ordered=False,
+                    )
+                    total += len(batch)
+        except Exception:
+            await job_rows_collection.delete_many({"job_id": job_id})
+            await jobs_collection.delete_one({"_id": job_id})
+            raise
+
+        # From here on any process polling for running jobs may claim rows
+        await jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"total": total, "status": RUNNING, "started_at": _now()}},
+        )
+        self._spawn(str(job_id))
+        return str(job_id), total
+
+    def _spawn(self, job_id: str):
+        if job_id in self._tasks:
+            return
+        task = asyncio.create_task(self._run(job_id), name=f"excel-job-{job_id}")
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _claim(self, oid: ObjectId) -> List[Dict[str, Any]]:
+        """
+        Claims up to JOB_CHUNK_SIZE pending rows of a running job for this process.
+
+        Returns:
+            list: The claimed rows in upload order; empty when the job is not
+            running or has no pending rows left.
+        """
+        while True:
+            if not await jobs_collection.find_one({"_id": oid, "status": RUNNING}, {"_id": 1}):
+                return []
+            pending = job_rows_collection.find(
+                {"job_id": oid, "status": ROW_PENDING}, {"_id": 1}
+            ).sort("row_index", 1).limit(JOB_CHUNK_SIZE)
+            ids = [row["_id"] async for row in pending]
+            if not ids:
+                return []
+
+            claim_id = ObjectId()
+            # Only rows still pending are taken; another process may have claimed some meanwhile
+            await job_rows_collection.update_many(
+                {"_id": {"$in": ids}, "status": ROW_PENDING},
+                {"$set": {
+                    "status": ROW_CLAIMED,
+                    "claimed_by": self.owner,
+                    "claim_id": claim_id,
+                    "claim_expires": _now() + timedelta(seconds=JOB_CLAIM_TTL),
+                }},
+            )
+            claimed = job_rows_collection.find(
+                {"job_id": oid, "status": ROW_CLAIMED, "claim_id": claim_id},
+                {"username": 1, "fields": 1},
+            ).sort("row_index", 1)
+            rows = [row async for row in claimed]
+            if rows:
+                return rows
+
+    async def _release_claims(self, oid: ObjectId):
+        """Puts rows this process claimed but did not finish back in the queue."""
+        await job_rows_collection.update_many(
+            {"job_id": oid, "status": ROW_CLAIMED, "claimed_by": self.owner},
+            {"$set": {"status": ROW_PENDING}, "$unset": {"claimed_by": "", "claim_id": "", "claim_expires": ""}},
+        )
+
+    async def _finish(self, oid: ObjectId, status: str) -> bool:
+        """
+        Moves a running job to `status` and adds its run time to active_seconds.
+
+        Returns:
+            bool: False if the job was not running (another process finished it first).
+        """
+        now = _now()
+        job = await jobs_collection.find_one_and_update(
+            {"_id": oid, "status": RUNNING},
+            {"$set": {"status": status, "finished_at": now}},
+            projection={"started_at": 1},
+        )
+        if not job:
+            return False
+        if job.get("started_at"):
+            await jobs_collection.update_one(
+                {"_id": oid}, {"$inc": {"active_seconds": (now - as_utc(job["started_at"])).total_seconds()}}
+            )
+        logger.info(f"Job {oid} {status}")
+        return True
+
+    async def _run(self, job_id: str):
+        """Works on one job in this process until no claimable rows are left."""
+        oid = ObjectId(job_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        results = _RowResultBuffer(oid)
+        results.start()
+
+        async def feed():
+            while True:
+                chunk = await self._claim(oid)
+                if not chunk:
+                    break
+                await self._dispatch_chunk(chunk, queue, results)
+            for _ in range(self.workers):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                row = await queue.get()
+                if row is None:
+                    return
+                await self._process_row(row, results)
+
+        try:
+            await asyncio.gather(feed(), *[work() for _ in range(self.workers)])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Job {job_id} crashed in this process; its rows go back to the queue")
+        finally:
+            # Keep whatever already finished; everything else is claimable again
+            try:
+                await results.close()
+            except Exception:
+                logger.exception(f"Final flush failed for job {job_id}")
+            try:
+                await self._release_claims(oid)
+            except Exception:
+                logger.exception(f"Could not release claims of job {job_id}; they expire after {JOB_CLAIM_TTL}s")
+
+        remaining = await job_rows_collection.count_documents(
+            {"job_id": oid, "status": {"$in": [ROW_PENDING, ROW_CLAIMED]}}, limit=1
+        )
+        if not remaining:
+            await self._finish(oid, COMPLETED)
+
+    async def _dispatch_chunk(self, chunk, queue: asyncio.Queue, results: "_RowResultBuffer"):
+        # One indexed $in + scraped_at range lookup per chunk instead of one find_one per row
+        usernames = list({row["username"] for row in chunk})
+        cursor = creators_collection.find(
+            {"username": {"$in": usernames}, **fresh_filter()}, {"username": 1, "_id": 0}
+        )
+        fresh = {doc["username"] async for doc in cursor}
+
+        for row in chunk:
+            if row["username"] in fresh:
+                await results.add(row["_id"], ROW_SKIPPED, row["username"])
+            else:
+                await queue.put(row)
+
+    async def _process_row(self, row: Dict[str, Any], results: "_RowResultBuffer"):
+        username = row["username"]
+        try:
+            logger.info(f"Scraping: {username}")
+            try:
+                scraped = await scrape_scheduler.submit(username, priority=PRIORITY_BULK)
+            except ScrapeFailed as e:
+                logger.warning(f"Failed to scrape {username}: {e.reason}")
+                await results.add(row["_id"], ROW_FAILED, username, reason=e.reason)
+                return
+
+            scraped_at = _now()
+            # History records what upstream reported; sheet columns (follower counts included) only go on the creator
+            history = history_op({**scraped, "scraped_at": scraped_at})
+            scraped.update(row.get("fields", {}))
+            scraped.update({
+                "source": "excel+scraped",
+                "scraped_at": scraped_at
+            })
+            await results.add(
+                row["_id"],
+                ROW_DONE,
+                username,
+                UpdateOne({"username": username}, {"$set": scraped}, upsert=True),
+                history=history,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Error processing {username}: {e}")
+            await results.add(row["_id"], ROW_FAILED, username, reason=FAILURE_INTERNAL)
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Stops a running job. Other processes notice before their next claim;
+        rows they already hold are finished, unclaimed rows stay pending for resume.
+        """
+        oid = _job_id(job_id)
+        if oid is None or not await self._finish(oid, CANCELLED):
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def resume(self, job_id: str) -> Optional[str]:
+        """
+        Restarts a cancelled or interrupted job in every process; finished rows are not scraped again.
+
+        Returns:
+            str | None: The job status after the call, or None if the job does not exist.
+        """
+        oid = _job_id(job_id)
+        job = await jobs_collection.find_one({"_id": oid}, {"status": 1}) if oid else None
+        if not job:
+            return None
+        if job["status"] not in RESUMABLE_STATES:
+            return job["status"]
+        resumed = await jobs_collection.update_one(
+            {"_id": oid, "status": job["status"]},
+            {"$set": {"status": RUNNING, "started_at": _now(), "finished_at": None}},
+        )
+        if not resumed.modified_count:
+            return (await jobs_collection.find_one({"_id": oid}, {"status": 1}))["status"]
+        self._spawn(job_id)
+        return RUNNING
+
+    async def progress(self, job_id: str, failed_limit: int = 500) -> Optional[Dict[str, Any]]:
+        oid = _job_id(job_id)
+        job = await jobs_collection.find_one({"_id": oid}) if oid else None
+        if not job:
+            return None
+
+        elapsed = job.get("active_seconds", 0.0)
+        if job["status"] == RUNNING and job.get("started_at"):
+            elapsed += (_now() - as_utc(job["started_at"])).total_seconds()
+
+        failed_rows = job_rows_collection.find(
+            {"job_id": oid, "status": ROW_FAILED}, {"username": 1, "failure_reason": 1, "_id": 0}
+        ).sort("row_index", 1).limit(failed_limit)
+        failures = [
+            {"username": row["username"], "reason": row.get("failure_reason")}
+            async for row in failed_rows
+        ]
+        reason_counts = job_rows_collection.aggregate([
+            {"$match": {"job_id": oid, "status": ROW_FAILED}},
+            {"$group": {"_id": "$failure_reason", "count": {"$sum": 1}}},
+        ])
+        failure_reasons = {doc["_id"] or "unknown": doc["count"] async for doc in reason_counts}
+
+        total = job.get("total", 0)
+        processed = job.get("processed", 0)
+        return {
+            "job_id": job_id,
+            "filename": job.get("filename"),
+            "status": job["status"],
+            "total": total,
+            "processed": processed,
+            "inserted": job.get("inserted", 0),
+            "skipped": job.get("skipped", 0),
+            "failed": job.get("failed", 0),
+            "percent_complete": round(100 * processed / total, 2) if total else 100.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "failed_usernames": [f["username"] for f in failures],
+            "failures": failures,
+            "failure_reasons": failure_reasons,
+            "created_at": job.get("created_at"),
+            "finished_at": job.get("finished_at"),
+        }
+
+    async def _maintain(self):
+        """Renews this process's row claims and frees claims that expired elsewhere."""
+        now = _now()
+        await job_rows_collection.update_many(
+            {"status": ROW_CLAIMED, "claimed_by": self.owner},
+            {"$set": {"claim_expires": now + timedelta(seconds=JOB_CLAIM_TTL)}},
+        )
+        reaped = await job_rows_collection.update_many(
+            {"status": ROW_CLAIMED, "claim_expires": {"$lt": now}},
+            {"$set": {"status": ROW_PENDING}, "$unset": {"claimed_by": "", "claim_id": "", "claim_expires": ""}},
+        )
+        if reaped.modified_count:
+            logger.warning(f"Returned {reaped.modified_count} rows with expired claims to the queue")
+
+    async def _poll(self):
+        while True:
+            try:
+                if time.monotonic() - self._maintained_at >= JOB_CLAIM_TTL / 3:
+                    self._maintained_at = time.monotonic()
+                    await self._maintain()
+                async for job in jobs_collection.find({"status": RUNNING}, {"_id": 1}):
+                    self._spawn(str(job["_id"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Polling for upload jobs failed")
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    async def start(self):
+        # Running jobs simply continue: this and every other process pick them up from Mongo.
+        # A job still "queued" this long after creation lost its upload midway; let it be resumed.
+        try:
+            await jobs_collection.update_many(
+                {"status": QUEUED, "created_at": {"$lt": _now() - timedelta(seconds=JOB_CLAIM_TTL)}},
+                {"$set": {"status": INTERRUPTED}},
+            )
+        except Exception:
+            logger.exception("Could not mark stale upload jobs as interrupted")
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll(), name="excel-job-poller")
+
+    async def close(self):
+        """Stops work in this process; its unfinished rows go back to the queue for other processes."""
+        tasks = list(self._tasks.values())
+        if self._poller is not None:
+            tasks.append(self._poller)
+            self._poller = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Shared instance
+job_runner = ExcelJobRunner()
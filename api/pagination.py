@@ -0,0 +1,70 @@
+# pagination.py (keyset pagination helpers for list endpoints)
+import base64
+import json
+from typing import Optional, Dict, Any
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_by: str, order: str, last_doc: Dict[str, Any]) -> str:
+    """
+    Builds an opaque continuation token from the last document of a page.
+
+    Args:
+        sort_by (str): Field the page is sorted on.
+        order (str): "asc" or "desc".
+        last_doc (dict): Last document returned (must contain "username").
+
+    Returns:
+        str: URL-safe token to pass back as `cursor`.
+    """
+    payload = {"s": sort_by, "o": order, "v": last_doc.get(sort_by), "u": last_doc["username"]}
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_by: str, order: str) -> Dict[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or "u" not in payload:
+            raise ValueError
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if payload.get("s") != sort_by or payload.get("o") != order:
+        raise InvalidCursor("Cursor was issued for a different sort; restart from the first page")
+    return payload
+
+
+def keyset_filter(sort_by: str, order: str, cursor: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Mongo filter selecting documents strictly after the cursor position.
+
+    Pages are sorted on (sort_by, username) in the same direction; username is
+    unique so ties never repeat or skip documents. Missing/null values sort
+    lowest in Mongo, i.e. first when ascending and last when descending.
+    """
+    if cursor is None:
+        return None
+    value, username = cursor.get("v"), cursor["u"]
+
+    if order == "desc":
+        if value is None:
+            return {sort_by: None, "username": {"$lt": username}}
+        return {"$or": [
+            {sort_by: {"$lt": value}},
+            {sort_by: value, "username": {"$lt": username}},
+            {sort_by: None},
+        ]}
+
+    if value is None:
+        return {"$or": [
+            {sort_by: None, "username": {"$gt": username}},
+            {sort_by: {"$ne": None}},
+        ]}
+    return {"$or": [
+        {sort_by: {"$gt": value}},
+        {sort_by: value, "username": {"$gt": username}},
+    ]}
@@ -0,0 +1,255 @@
+# refresher.py (background re-scraping of stale creators within a daily budget)
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
+
+from pymongo import ASCENDING
+
+from database.mongo import creators_collection, refresh_budget_collection
+from database.freshness import as_utc
+from database.history import record_history
+from scraper.scheduler import scrape_scheduler, PRIORITY_BACKGROUND
+from scraper.coordination import COORDINATION_ENABLED, LEASE_TTL, lease_manager
+from scraper.worker import ScrapeFailed
+from api.cache import read_cache
+
+logger = logging.getLogger(__name__)
+
+REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "true").lower() in ("1", "true", "yes")
+# Upstream requests the refresher may spend per UTC day
+REFRESH_DAILY_BUDGET = int(os.getenv("REFRESH_DAILY_BUDGET", "5000"))
+REFRESH_BATCH_SIZE = int(os.getenv("REFRESH_BATCH_SIZE", "100"))
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "4"))
+REFRESH_IDLE_INTERVAL = float(os.getenv("REFRESH_IDLE_INTERVAL", "300"))
+# A creator whose refresh failed is not picked again for this long
+REFRESH_FAILURE_BACKOFF = timedelta(hours=float(os.getenv("REFRESH_FAILURE_BACKOFF_HOURS", "24")))
+# "min_followers:sla_hours" pairs; a creator belongs to the highest tier it reaches
+REFRESH_TIERS = os.getenv("REFRESH_TIERS", "1000000:6,100000:24,10000:72,0:168")
+REFRESHER_LEASE = "refresher"
+
+
+def parse_tiers(spec: str) -> List[Tuple[int, timedelta]]:
+    """
+    Parses REFRESH_TIERS into (min_followers, sla) pairs, largest tier first.
+    """
+    tiers = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        min_followers, hours = part.split(":")
+        tiers.append((int(min_followers), timedelta(hours=float(hours))))
+    if not tiers:
+        raise ValueError("REFRESH_TIERS defines no tiers")
+    return sorted(tiers, key=lambda t: t[0], reverse=True)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _budget_day(now: datetime) -> str:
+    return now.strftime("%Y-%m-%d")
+
+
+class CreatorRefresher:
+    """
+    Keeps creators fresh by re-scraping the most overdue ones in the background.
+
+    Each follower tier has its own freshness SLA. Candidates from every tier are
+    ranked by how far past their SLA they are (age / SLA), so big accounts,
+    which have short SLAs, come first without starving the long tail. Requests
+    are spread evenly over the day and counted against REFRESH_DAILY_BUDGET in
+    Mongo, so restarts and multiple API processes share one budget. With
+    COORDINATION_ENABLED only the process holding the "refresher" lease runs
+    batches; the others stand by to take over if it goes away.
+    """
+
+    def __init__(
+        self,
+        daily_budget: int = REFRESH_DAILY_BUDGET,
+        tiers: Optional[List[Tuple[int, timedelta]]] = None,
+        batch_size: int = REFRESH_BATCH_SIZE,
+        concurrency: int = REFRESH_CONCURRENCY,
+    ):
+        self.daily_budget = daily_budget
+        self.tiers = tiers or parse_tiers(REFRESH_TIERS)
+        self.batch_size = max(1, batch_size)
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self._refreshed = 0
+        self._failed = 0
+        self._last_batch_at: Optional[datetime] = None
+        self._leader = not COORDINATION_ENABLED
+
+    @property
+    def interval(self) -> float:
+        """Seconds between two refresh requests at the configured budget."""
+        return 86400 / self.daily_budget
+
+    def _tier_filters(self, now: datetime) -> List[Tuple[timedelta, Dict[str, Any]]]:
+        filters = []
+        upper = None
+        for i, (min_followers, sla) in enumerate(self.tiers):
+            if i == len(self.tiers) - 1:
+                # Lowest tier also takes creators without a follower count
+                followers = {"$not": {"$gte": upper}} if upper is not None else None
+            else:
+                followers = {"$gte": min_followers}
+                if upper is not None:
+                    followers["$lt"] = upper
+            query = {
+                "scraped_at": {"$lt": now - sla},
+                "refresh_after": {"$not": {"$gt": now}},
+            }
+            if followers is not None:
+                query["follower_count"] = followers
+            filters.append((sla, query))
+            upper = min_followers
+        return filters
+
+    async def pick_candidates(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Returns up to `limit` overdue creators, most overdue (relative to their tier SLA) first.
+        """
+        now = _now()
+        ranked = []
+        for sla, query in self._tier_filters(now):
+            cursor = creators_collection.find(
+                query, {"_id": 0, "username": 1, "scraped_at": 1, "follower_count": 1}
+            ).sort("scraped_at", ASCENDING).limit(limit)
+            async for doc in cursor:
+                age = now - as_utc(doc["scraped_at"])
+                ranked.append((age / sla, doc))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [doc for _, doc in ranked[:limit]]
+
+    async def budget_left(self) -> int:
+        doc = await refresh_budget_collection.find_one({"_id": _budget_day(_now())})
+        return max(0, self.daily_budget - (doc or {}).get("used", 0))
+
+    async def _spend(self):
+        await refresh_budget_collection.update_one(
+            {"_id": _budget_day(_now())}, {"$inc": {"used": 1}}, upsert=True
+        )
+
+    async def start(self):
+        if not REFRESH_ENABLED or self.daily_budget <= 0:
+            logger.info("Creator refresher disabled")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="creator-refresher")
+
+    async def close(self):
+        tasks = list(self._inflight)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        if COORDINATION_ENABLED and self._leader:
+            # Let a standby process take over now instead of after LEASE_TTL
+            await lease_manager.release(REFRESHER_LEASE)
+            self._leader = False
+
+    async def _lead(self) -> bool:
+        """Takes or renews the refresher lease (always True without coordination)."""
+        if COORDINATION_ENABLED:
+            # Renewed before every request, so it must outlast one pacing interval
+            self._leader = await lease_manager.acquire(REFRESHER_LEASE, ttl=max(LEASE_TTL, 2 * self.interval))
+        return self._leader
+
+    async def _loop(self):
+        while True:
+            try:
+                if not await self._lead():
+                    await asyncio.sleep(LEASE_TTL / 2)
+                    continue
+
+                remaining = await self.budget_left()
+                if remaining <= 0:
+                    now = _now()
+                    tomorrow = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+                    logger.info("Daily refresh budget spent; waiting for the next day")
+                    await asyncio.sleep(min(REFRESH_IDLE_INTERVAL, (tomorrow - now).total_seconds() + 1))
+                    continue
+
+                candidates = await self.pick_candidates(min(remaining, self.batch_size))
+                self._last_batch_at = _now()
+                if not candidates:
+                    await asyncio.sleep(REFRESH_IDLE_INTERVAL)
+                    continue
+
+                for doc in candidates:
+                    if not await self._lead():
+                        logger.info("Lost the refresher lease to another process")
+                        break
+                    # Charged before taking a slot: if Mongo fails here, no slot is left held by a task that never started
+                    await self._spend()
+                    await self._slots.acquire()
+                    task = asyncio.create_task(self._refresh(doc["username"]))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+                    # Pace requests evenly across the day instead of bursting the budget
+                    await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Refresher cycle failed")
+                await asyncio.sleep(REFRESH_IDLE_INTERVAL)
+
+    async def _refresh(self, username: str):
+        try:
+            # One upstream request per budget unit: a failure waits for REFRESH_FAILURE_BACKOFF instead of retrying
+            scraped = dict(await scrape_scheduler.submit(username, priority=PRIORITY_BACKGROUND, max_attempts=1))
+            # Keep the original provenance (api / excel+scraped) of the document
+            scraped.pop("source", None)
+            scraped["refreshed_at"] = scraped["scraped_at"]
+            await creators_collection.update_one(
+                {"username": username},
+                {"$set": scraped, "$unset": {"refresh_after": "", "last_failure": ""}},
+            )
+            read_cache.invalidate_usernames([username])
+            self._refreshed += 1
+            await record_history([{**scraped, "username": username}])
+        except ScrapeFailed as e:
+            self._failed += 1
+            now = _now()
+            await creators_collection.update_one(
+                {"username": username},
+                {"$set": {
+                    "refresh_after": now + REFRESH_FAILURE_BACKOFF,
+                    "last_failure": {"reason": e.reason, "status_code": e.status_code, "at": now},
+                }},
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._failed += 1
+            logger.exception(f"Refresh of {username} failed")
+        finally:
+            self._slots.release()
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._task is not None,
+            "leader": self._task is not None and self._leader,
+            "daily_budget": self.daily_budget,
+            "budget_left_today": await self.budget_left(),
+            "interval_seconds": round(self.interval, 2) if self.daily_budget > 0 else None,
+            "tiers": [
+                {"min_followers": min_followers, "sla_hours": sla.total_seconds() / 3600}
+                for min_followers, sla in self.tiers
+            ],
+            "in_flight": len(self._inflight),
+            "refreshed": self._refreshed,
+            "failed": self._failed,
+            "last_batch_at": self._last_batch_at,
+        }
+
+
+# Shared instance
+creator_refresher = CreatorRefresher()
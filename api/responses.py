@@ -0,0 +1,96 @@
+# responses.py (fast JSON responses and streamed cursor output for read routes)
+import importlib.util
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+# Buffered responses above this many documents are streamed as a JSON array instead
+STREAM_THRESHOLD = int(os.getenv("STREAM_THRESHOLD", "1000"))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+RESPONSE_FORMATS = ("json", "ndjson")
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+if HAS_ORJSON:
+    import orjson
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializes Mongo documents (datetimes, ObjectIds) to JSON bytes, with orjson when installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with `dumps`.
+
+    Returning one directly from a route also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return dumps(content)
+        except TypeError:
+            # Pydantic models and other types only FastAPI's encoder knows about
+            return dumps(jsonable_encoder(content))
+
+
+async def _json_array(cursor) -> AsyncIterator[bytes]:
+    yield b"["
+    first = True
+    async for doc in cursor:
+        yield (b"" if first else b",") + dumps(doc)
+        first = False
+    yield b"]"
+
+
+async def _ndjson(cursor) -> AsyncIterator[bytes]:
+    async for doc in cursor:
+        yield dumps(doc) + b"\n"
+
+
+async def _guarded(chunks: AsyncIterator[bytes], label: str) -> AsyncIterator[bytes]:
+    # Headers are already sent, so a failure can only end the body early
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception:
+        logger.exception(f"Streaming {label} failed mid-response")
+
+
+def stream_cursor(cursor, fmt: str = "json", label: str = "results", batch_size: Optional[int] = None) -> StreamingResponse:
+    """
+    Streams a Motor cursor as a JSON array or NDJSON, one batch from Mongo at a time.
+
+    Args:
+        cursor: An unconsumed Motor cursor (project `_id` away if it should not be sent).
+        fmt (str): "json" for a JSON array, "ndjson" for one document per line.
+        label (str): Used in the log line if the stream breaks.
+        batch_size (int, optional): Documents per getMore; defaults to STREAM_BATCH_SIZE.
+
+    Returns:
+        StreamingResponse: Body is produced while the cursor is read, so memory stays flat.
+    """
+    cursor = cursor.batch_size(batch_size or STREAM_BATCH_SIZE)
+    if fmt == "ndjson":
+        return StreamingResponse(_guarded(_ndjson(cursor), label), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(_guarded(_json_array(cursor), label), media_type="application/json")
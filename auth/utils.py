@@ -1,13 +1,21 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor; existing hashes with another cost are upgraded on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads doing bcrypt at once; keeps login bursts off the event loop without starving it of CPU
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+_hash_pool = ThreadPoolExecutor(max_workers=max(1, PASSWORD_HASH_WORKERS), thread_name_prefix="bcrypt")
 
 def hash_password(password: str):
     return pwd_context.hash(password)
@@ -15,6 +23,17 @@ def hash_password(password: str):
 def verify_password(plain, hashed):
     return pwd_context.verify(plain, hashed)
 
+def password_needs_rehash(hashed: str) -> bool:
+    return pwd_context.needs_update(hashed)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt thread pool, so the event loop keeps serving requests."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, hash_password, password)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password on the bcrypt thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, verify_password, plain, hashed)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
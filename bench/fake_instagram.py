@@ -0,0 +1,164 @@
+# fake_instagram.py (local stand-in for Instagram's web_profile_info endpoint)
+import asyncio
+import hashlib
+import random
+import socket
+import threading
+import time
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+
+class FakeInstagramConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Args:
+        latency (float): Mean response latency in seconds.
+        jitter (float): Latency varies uniformly by +/- this fraction of `latency`.
+        error_rate (float): Share of requests answered with a 500.
+        throttle_rate (float): Share of requests answered with a 429.
+        max_rps (float): Requests per second above which every request gets a 429 (0 = unlimited).
+        retry_after (int): Retry-After header sent with 429s.
+        missing_prefix (str): Usernames starting with this get a 404.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.15,
+        jitter: float = 0.5,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_rps: float = 0.0,
+        retry_after: int = 1,
+        missing_prefix: str = "missing_",
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.missing_prefix = missing_prefix
+        self.random = random.Random(seed)
+
+
+def _media(digest: int, followers: int, posts: int = 12) -> dict:
+    # Newest first, like Instagram; every third post is a video
+    newest = 1_700_000_000 - digest % 86_400
+    edges = []
+    for i in range(posts):
+        likes = followers * (1 + (digest + i) % 6) // 100
+        edges.append({"node": {
+            "taken_at_timestamp": newest - i * 86_400 * (1 + digest % 4),
+            "edge_liked_by": {"count": likes},
+            "edge_media_to_comment": {"count": likes // 40},
+            "is_video": i % 3 == 0,
+            "video_view_count": likes * 8 if i % 3 == 0 else None,
+        }})
+    return {"count": 40 + digest % 900, "edges": edges}
+
+
+def _profile(username: str) -> dict:
+    # Stable per-username numbers so repeated runs produce the same data
+    digest = int(hashlib.sha1(username.encode()).hexdigest()[:8], 16)
+    followers = 1000 + digest % 5_000_000
+    return {
+        "username": username,
+        "biography": f"Creator from Mumbai, India #{digest % 97}",
+        "profile_pic_url": f"https://example.invalid/{username}.jpg",
+        "edge_followed_by": {"count": followers},
+        "edge_follow": {"count": digest % 2000},
+        "edge_owner_to_timeline_media": _media(digest, followers),
+    }
+
+
+def create_app(config: FakeInstagramConfig) -> FastAPI:
+    app = FastAPI()
+    app.state.requests = 0
+    window = {"second": 0, "count": 0}
+
+    @app.get("/api/v1/users/web_profile_info/")
+    async def web_profile_info(username: str = Query(...)):
+        app.state.requests += 1
+        now = int(time.monotonic())
+        if window["second"] != now:
+            window["second"], window["count"] = now, 0
+        window["count"] += 1
+
+        rnd = config.random
+        delay = config.latency * (1 + rnd.uniform(-config.jitter, config.jitter))
+        await asyncio.sleep(max(0.0, delay))
+
+        if (config.max_rps and window["count"] > config.max_rps) or rnd.random() < config.throttle_rate:
+            return JSONResponse({"message": "Please wait a few minutes"}, status_code=429,
+                                headers={"Retry-After": str(config.retry_after)})
+        if rnd.random() < config.error_rate:
+            return JSONResponse({"message": "Internal error"}, status_code=500)
+        if username.startswith(config.missing_prefix):
+            return JSONResponse({"message": "Not found"}, status_code=404)
+        return {"data": {"user": _profile(username)}, "status": "ok"}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class FakeInstagramServer:
+    """Runs the stand-in on a background thread, so its event loop does not compete with the app's."""
+
+    def __init__(self, config: FakeInstagramConfig, port: Optional[int] = None):
+        self.app = create_app(config)
+        self.port = port or _free_port()
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.run, name="fake-instagram", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake Instagram server did not start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a fake web_profile_info endpoint")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    args = parser.parse_args()
+    config = FakeInstagramConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+    )
+    print(f"export INSTAGRAM_API_BASE=http://127.0.0.1:{args.port}")
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,70 @@
+# report.py (latency summaries and run-to-run comparison for bench results)
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; None for an empty sample."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float, units: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Args:
+        latencies (list): Per-request latencies in seconds (successful requests only).
+        errors (int): Requests that failed.
+        seconds (float): Wall-clock time of the scenario.
+        units (int, optional): Work items for the throughput figure (defaults to requests).
+
+    Returns:
+        dict: Counts, throughput per second and p50/p95/p99/max latency in milliseconds.
+    """
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    count = units if units is not None else len(latencies) + errors
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput": round(count / seconds, 2) if seconds > 0 else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(max(latencies) if latencies else None),
+    }
+
+
+COLUMNS = ("requests", "errors", "seconds", "throughput", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+def format_table(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Renders results as a fixed-width table; with a baseline, throughput and p95 get a % change."""
+    width = max([len("scenario")] + [len(name) for name in results])
+    lines = [" ".join(["scenario".ljust(width)] + [c.rjust(11) for c in COLUMNS])]
+    for name, row in results.items():
+        cells = [name.ljust(width)]
+        for column in COLUMNS:
+            value = row.get(column)
+            cells.append(("-" if value is None else str(value)).rjust(11))
+        lines.append(" ".join(cells))
+        base = (baseline or {}).get(name)
+        if base:
+            lines.append(" ".join([" " * width] + [_delta(base.get(c), row.get(c)).rjust(11) for c in COLUMNS]))
+    return "\n".join(lines)
+
+
+def _delta(before, after) -> str:
+    if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or before == 0:
+        return ""
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["results"]
@@ -0,0 +1,255 @@
+# run.py (offline benchmark: fake Instagram + in-memory or local Mongo)
+"""
+Runs scripted scenarios against the API in-process and reports throughput and
+p50/p95/p99 latency, without touching Instagram or Atlas.
+
+    python -m bench.run                                   # all scenarios, in-memory Mongo
+    python -m bench.run --scenarios upload --rows 10000 --out after.json --compare before.json
+    python -m bench.run --mongo-uri mongodb://localhost:27017 --reset
+
+In-memory mode needs `mongomock-motor`. Scheduler and job settings come from
+the usual environment variables (SCRAPE_MAX_CONCURRENCY, JOB_WORKERS, ...);
+--scrape-rate only sets SCRAPE_RATE_PER_SECOND when it is not already set.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from bench.fake_instagram import FakeInstagramConfig, FakeInstagramServer
+from bench.report import summarize, format_table, load_results
+
+SCENARIOS = ("single", "upload", "reads", "login")
+
+
+def _use_in_memory_mongo():
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("In-memory mode needs mongomock-motor (pip install mongomock-motor), or pass --mongo-uri")
+    import database.mongo as mongo
+    mongo.connect(motor_client=AsyncMongoMockClient(tz_aware=True))
+
+
+async def _timed(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> Tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+async def _run_requests(client, requests: List[Tuple[str, str, dict]], concurrency: int) -> Dict[str, Any]:
+    latencies, errors = [], 0
+    queue = list(reversed(requests))
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            method, url, kwargs = queue.pop()
+            elapsed, ok = await _timed(client, method, url, **kwargs)
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+# === Scenarios ===
+async def scenario_single(client, args) -> Dict[str, Dict[str, Any]]:
+    """Sequential interactive scrapes of distinct usernames (end-to-end latency of one profile)."""
+    requests = [("POST", f"/creators/scrape/bench_single_{args.run_id}_{i}", {}) for i in range(args.single)]
+    return {"single_scrape": await _run_requests(client, requests, 1)}
+
+
+def _upload_csv(rows: int, run_id: str) -> bytes:
+    out = io.StringIO()
+    out.write("Username,Followers,Avg Reel Views,Avg Story Views,Price for Reel+ Story (INR),Profile Link\n")
+    for i in range(rows):
+        username = f"bench_up_{run_id}_{i}"
+        out.write(f"{username},{(i * 7919) % 900}K,{i % 50}K,{i % 20}K,\"5,000-10,000\",https://instagram.com/{username}\n")
+    return out.getvalue().encode()
+
+
+async def scenario_upload(client, args) -> Dict[str, Dict[str, Any]]:
+    """Uploads a generated CSV and waits for the background job to finish."""
+    payload = _upload_csv(args.rows, args.run_id)
+    started = time.perf_counter()
+    response = await client.post(
+        "/creators/upload-excel", files={"file": ("bench.csv", payload, "text/csv")}
+    )
+    accepted = time.perf_counter() - started
+    response.raise_for_status()
+    job_id = response.json()["job_id"]
+
+    progress = {}
+    while True:
+        progress = (await client.get(f"/creators/jobs/{job_id}")).json()
+        if progress["status"] in ("completed", "cancelled", "interrupted"):
+            break
+        await asyncio.sleep(0.25)
+    total = time.perf_counter() - started
+    return {
+        "upload_accept": summarize([accepted], 0, accepted),
+        "upload_job": summarize([], progress.get("failed", 0), total, units=progress.get("processed", 0)),
+    }
+
+
+async def scenario_reads(client, args) -> Dict[str, Dict[str, Any]]:
+    """Concurrent filtered and paginated reads with varied parameters."""
+    rnd = random.Random(7)
+    requests = []
+    for i in range(args.reads):
+        low = rnd.randrange(0, 800_000, 1000)
+        if i % 2:
+            params = {"min_followers": low, "max_followers": low + 200_000, "limit": 50}
+            if i % 4 == 1:
+                params["location"] = "mumbai"
+            requests.append(("GET", "/creators/", {"params": params}))
+        else:
+            sort_by = rnd.choice(["follower_count", "avg_reel_views"])
+            requests.append(("GET", "/creators/all", {"params": {"sort_by": sort_by, "min_followers": low, "limit": 50}}))
+    return {"filtered_reads": await _run_requests(client, requests, args.concurrency)}
+
+
+async def scenario_login(client, args) -> Dict[str, Dict[str, Any]]:
+    """A burst of logins while a probe keeps reading /creators/all; the probe shows event-loop stalls."""
+    credentials = {"email": f"bench_{args.run_id}@example.com", "password": "bench-password"}
+    await client.post("/auth/signup", json=credentials)
+
+    probe_latencies, probe_errors, burst_done = [], 0, asyncio.Event()
+
+    async def probe():
+        nonlocal probe_errors
+        while not burst_done.is_set():
+            elapsed, ok = await _timed(client, "GET", "/creators/all", params={"limit": 10})
+            if ok:
+                probe_latencies.append(elapsed)
+            else:
+                probe_errors += 1
+            await asyncio.sleep(0.01)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    burst = await _run_requests(client, [("POST", "/auth/login", {"json": credentials})] * args.logins, args.logins)
+    burst_done.set()
+    await probe_task
+    return {
+        "login_burst": burst,
+        "reads_during_logins": summarize(probe_latencies, probe_errors, time.perf_counter() - started),
+    }
+
+
+RUNNERS = {
+    "single": scenario_single,
+    "upload": scenario_upload,
+    "reads": scenario_reads,
+    "login": scenario_login,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def _run(args) -> Dict[str, Dict[str, Any]]:
+    # Imported late: the environment and Mongo stand-in must be in place first
+    import main
+    import database.mongo as mongo
+
+    if args.mongo_uri and args.reset:
+        for collection in mongo.registered_collections:
+            await collection.drop()
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in args.scenarios:
+                print(f"Running {name}...", file=sys.stderr)
+                results.update(await RUNNERS[name](client, args))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the Instifier API")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in the upload scenario")
+    parser.add_argument("--single", type=int, default=50, help="Profiles in the single-scrape scenario")
+    parser.add_argument("--reads", type=int, default=2000, help="Requests in the reads scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients in the reads scenario")
+    parser.add_argument("--logins", type=int, default=20, help="Concurrent logins in the login scenario")
+    parser.add_argument("--latency", type=float, default=0.15, help="Fake Instagram mean latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of fake 429 responses")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Fake 429 above this many requests/s (0 = off)")
+    parser.add_argument("--scrape-rate", type=float, default=500.0, help="SCRAPE_RATE_PER_SECOND unless already set")
+    parser.add_argument("--mongo-uri", help="Use a real (local) MongoDB instead of the in-memory stand-in")
+    parser.add_argument("--reset", action="store_true", help="Drop the API collections first (with --mongo-uri)")
+    parser.add_argument("--out", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier --out file to show % changes against")
+    args = parser.parse_args(argv)
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    args.run_id = datetime.now(timezone.utc).strftime("%H%M%S")
+
+    server = FakeInstagramServer(FakeInstagramConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        seed=1,
+    ))
+    server.start()
+
+    os.environ["INSTAGRAM_API_BASE"] = server.base_url
+    os.environ.setdefault("SCRAPE_RATE_PER_SECOND", str(args.scrape_rate))
+    os.environ.setdefault("SCRAPE_RATE_BURST", str(int(args.scrape_rate)))
+    os.environ.setdefault("REFRESH_ENABLED", "false")
+    os.environ.setdefault("INDEX_PLAN_CHECK", "off")
+    # The fake speaks HTTP/1.1 only
+    os.environ.setdefault("SCRAPER_HTTP2", "false")
+    if args.mongo_uri:
+        os.environ["MONGO_URI"] = args.mongo_uri
+    else:
+        _use_in_memory_mongo()
+
+    try:
+        results = asyncio.run(_run(args))
+    finally:
+        server.stop()
+
+    baseline = load_results(args.compare) if args.compare else None
+    print(format_table(results, baseline))
+    print(f"fake instagram requests: {server.requests}", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "commit": _git_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# distribution.py (follower and engagement histograms computed in Mongo)
+from typing import Any, Dict, List
+
+from database.mongo import creators_collection
+
+# Lower bounds; the last bucket is open-ended
+FOLLOWER_BUCKETS = [0, 1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000]
+# engagement_rate is a percentage of followers
+ENGAGEMENT_BUCKETS = [0, 0.5, 1, 2, 3, 5, 10]
+
+_ABOVE = "above"
+
+
+def _bucket_stage(field: str, boundaries: List[float]) -> List[Dict[str, Any]]:
+    return [
+        {"$match": {field: {"$type": "number"}}},
+        {"$bucket": {
+            "groupBy": f"${field}",
+            "boundaries": boundaries,
+            # Values past the last boundary land here
+            "default": _ABOVE,
+            "output": {"count": {"$sum": 1}},
+        }},
+    ]
+
+
+def distribution_pipeline(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    One aggregation answering every histogram: the match runs once, $facet buckets the result.
+
+    Args:
+        query (dict): Creator filter (see api.endpoints.creator_filter).
+    """
+    return [
+        {"$match": query},
+        # Only the bucketed fields travel into $facet
+        {"$project": {"_id": 0, "follower_count": 1, "engagement_rate": 1}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "followers": _bucket_stage("follower_count", FOLLOWER_BUCKETS),
+            "engagement": _bucket_stage("engagement_rate", ENGAGEMENT_BUCKETS),
+        }},
+    ]
+
+
+def _shape(rows: List[Dict[str, Any]], boundaries: List[float]) -> List[Dict[str, Any]]:
+    counts = {row["_id"]: row["count"] for row in rows}
+    uppers = boundaries[1:] + [None]
+    return [
+        {"min": low, "max": high, "count": counts.get(low if high is not None else _ABOVE, 0)}
+        for low, high in zip(boundaries, uppers)
+    ]
+
+
+async def creator_distribution(query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Follower and engagement histograms of the creators matching `query`.
+
+    Returns:
+        dict: total, followers and engagement bucket lists ({min, max, count}; max is
+        exclusive and None for the open last bucket), and engagement_unknown, the
+        creators without an engagement_rate yet.
+    """
+    result = await creators_collection.aggregate(distribution_pipeline(query)).to_list(length=1)
+    facets = result[0] if result else {}
+    total = (facets.get("total") or [{}])[0].get("count", 0)
+    engagement = _shape(facets.get("engagement", []), ENGAGEMENT_BUCKETS)
+    return {
+        "total": total,
+        "followers": _shape(facets.get("followers", []), FOLLOWER_BUCKETS),
+        "engagement": engagement,
+        "engagement_unknown": total - sum(bucket["count"] for bucket in engagement),
+    }
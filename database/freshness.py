@@ -0,0 +1,28 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+# A profile scraped more recently than this is not scraped again
+FRESHNESS_WINDOW = timedelta(hours=float(os.getenv("FRESHNESS_WINDOW_HOURS", "24")))
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treats naive datetimes as UTC (query params, older pymongo reads)."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def freshness_cutoff(window: timedelta = FRESHNESS_WINDOW, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)) - window
+
+
+def fresh_filter(window: timedelta = FRESHNESS_WINDOW) -> Dict[str, Any]:
+    """Creators scraped within the window (served by the scraped_at index)."""
+    return {"scraped_at": {"$gte": freshness_cutoff(window)}}
+
+
+def stale_filter(window: timedelta = FRESHNESS_WINDOW) -> Dict[str, Any]:
+    """Creators scraped before the window, or never stamped at all."""
+    return {"$or": [
+        {"scraped_at": {"$lt": freshness_cutoff(window)}},
+        {"scraped_at": None},
+    ]}
@@ -0,0 +1,145 @@
+# history.py (follower-count time series in per-creator monthly buckets)
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from database.mongo import follower_history_collection
+from database.freshness import as_utc
+
+GROWTH_SORTS = ("delta", "rate")
+
+
+def _month(ts: datetime) -> str:
+    return as_utc(ts).strftime("%Y-%m")
+
+
+def _months_since(since: datetime, now: datetime) -> List[str]:
+    months, cursor = [], datetime(since.year, since.month, 1, tzinfo=timezone.utc)
+    while cursor <= now:
+        months.append(cursor.strftime("%Y-%m"))
+        cursor = (cursor + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def history_op(profile: Dict[str, Any]) -> Optional[UpdateOne]:
+    """
+    Appends one sample for a scraped profile to its (username, month) bucket.
+
+    A bucket holds every sample of one creator for one calendar month, so a
+    scrape costs one small $push instead of a new document.
+
+    Returns:
+        UpdateOne | None: The upsert, or None if the profile has no follower count or timestamp.
+    """
+    ts = profile.get("scraped_at")
+    if profile.get("follower_count") is None or not isinstance(ts, datetime):
+        return None
+    ts = as_utc(ts)
+    sample = {"t": ts, "f": profile["follower_count"], "g": profile.get("following_count")}
+    return UpdateOne(
+        {"username": profile["username"], "month": _month(ts)},
+        {
+            "$push": {"samples": sample},
+            "$inc": {"count": 1},
+            "$min": {"first_at": ts},
+            "$max": {"last_at": ts},
+        },
+        upsert=True,
+    )
+
+
+async def record_history(profiles: List[Dict[str, Any]]):
+    ops = [op for op in (history_op(p) for p in profiles) if op is not None]
+    if ops:
+        await follower_history_collection.bulk_write(ops, ordered=False)
+
+
+def _window_pipeline(match: Dict[str, Any], since: datetime, now: datetime) -> List[Dict[str, Any]]:
+    return [
+        {"$match": {**match, "month": {"$in": _months_since(since, now)}}},
+        {"$unwind": "$samples"},
+        {"$match": {"samples.t": {"$gte": since}}},
+        {"$sort": {"username": 1, "samples.t": 1}},
+    ]
+
+
+async def creator_growth(username: str, days: int) -> Optional[Dict[str, Any]]:
+    """
+    Follower samples of one creator over the last `days` days with per-sample deltas.
+
+    Returns:
+        dict | None: Totals for the window plus the series, or None without samples in the window.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+    pipeline = _window_pipeline({"username": username}, since, now) + [
+        {"$project": {"_id": 0, "t": "$samples.t", "f": "$samples.f", "g": "$samples.g"}},
+    ]
+    samples = await follower_history_collection.aggregate(pipeline).to_list(length=None)
+    if not samples:
+        return None
+
+    series, previous = [], None
+    for s in samples:
+        series.append({
+            "at": s["t"],
+            "follower_count": s["f"],
+            "following_count": s.get("g"),
+            "delta": s["f"] - previous if previous is not None else 0,
+        })
+        previous = s["f"]
+
+    first, last = samples[0], samples[-1]
+    span_days = (as_utc(last["t"]) - as_utc(first["t"])).total_seconds() / 86400
+    delta = last["f"] - first["f"]
+    return {
+        "username": username,
+        "days": days,
+        "start_followers": first["f"],
+        "end_followers": last["f"],
+        "delta": delta,
+        "growth_rate": round(delta / first["f"], 6) if first["f"] else None,
+        "delta_per_day": round(delta / span_days, 2) if span_days > 0 else None,
+        "series": series,
+    }
+
+
+async def top_growers(days: int, limit: int, sort: str = "delta", min_followers: int = 0) -> List[Dict[str, Any]]:
+    """
+    Creators with the largest follower gain (absolute or relative) over the last `days` days.
+
+    Only creators with at least two samples in the window are ranked.
+    """
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+    sort_field = "growth_rate" if sort == "rate" else "delta"
+    pipeline = _window_pipeline({}, since, now) + [
+        {"$group": {
+            "_id": "$username",
+            "start_followers": {"$first": "$samples.f"},
+            "end_followers": {"$last": "$samples.f"},
+            "first_at": {"$first": "$samples.t"},
+            "last_at": {"$last": "$samples.t"},
+            "samples": {"$sum": 1},
+        }},
+        {"$match": {"samples": {"$gte": 2}, "start_followers": {"$gte": max(min_followers, 0)}}},
+        {"$project": {
+            "_id": 0,
+            "username": "$_id",
+            "start_followers": 1,
+            "end_followers": 1,
+            "first_at": 1,
+            "last_at": 1,
+            "samples": 1,
+            "delta": {"$subtract": ["$end_followers", "$start_followers"]},
+            "growth_rate": {"$cond": [
+                {"$gt": ["$start_followers", 0]},
+                {"$divide": [{"$subtract": ["$end_followers", "$start_followers"]}, "$start_followers"]},
+                None,
+            ]},
+        }},
+        {"$sort": {sort_field: -1, "username": 1}},
+        {"$limit": limit},
+    ]
+    return await follower_history_collection.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
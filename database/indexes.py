@@ -0,0 +1,182 @@
+import logging
+import os
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from database.mongo import (
+    creators_collection, users_collection, jobs_collection, job_rows_collection, follower_history_collection,
+    leases_collection, session_cooldowns_collection,
+)
+from database.freshness import fresh_filter, freshness_cutoff
+
+logger = logging.getLogger(__name__)
+
+# "warn" logs COLLSCAN plans, "fail" aborts startup, "off" skips the check
+INDEX_PLAN_CHECK = os.getenv("INDEX_PLAN_CHECK", "warn").lower()
+
+SORTABLE_FIELDS = (
+    "follower_count", "following_count", "avg_reel_views", "avg_story_views", "engagement_rate", "avg_likes",
+)
+
+INDEXES = [
+    (creators_collection, [
+        IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+        # filter_creators: follower range, optionally narrowed by engagement/account type/location
+        IndexModel([("follower_count", ASCENDING), ("engagement_rate", ASCENDING)], name="followers_engagement"),
+        IndexModel([("account_type", ASCENDING), ("follower_count", ASCENDING)], name="account_type_followers"),
+        IndexModel([("location_tokens", ASCENDING), ("follower_count", ASCENDING)], name="location_tokens_followers"),
+        IndexModel([("scraped_at", ASCENDING)], name="scraped_at"),
+        # refresher: oldest scraped_at first within a follower tier
+        IndexModel([("scraped_at", ASCENDING), ("follower_count", ASCENDING)], name="scraped_at_followers"),
+    ] + [
+        # /creators/all keyset pages sort on (field, username) in either direction
+        IndexModel([(field, DESCENDING), ("username", DESCENDING)], name=f"{field}_username")
+        for field in SORTABLE_FIELDS
+    ]),
+    (users_collection, [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ]),
+    (jobs_collection, [
+        IndexModel([("status", ASCENDING)], name="status"),
+    ]),
+    (follower_history_collection, [
+        # one bucket per creator per month; top growers scan a few months at a time
+        IndexModel([("username", ASCENDING), ("month", ASCENDING)], unique=True, name="username_month_unique"),
+        IndexModel([("month", ASCENDING), ("username", ASCENDING)], name="month_username"),
+    ]),
+    (job_rows_collection, [
+        IndexModel(
+            [("job_id", ASCENDING), ("status", ASCENDING), ("row_index", ASCENDING)],
+            name="job_status_row",
+        ),
+        # claim renewal and the reaper only ever look at claimed rows
+        IndexModel(
+            [("status", ASCENDING), ("claim_expires", ASCENDING)],
+            name="claimed_expires",
+            partialFilterExpression={"status": "claimed"},
+        ),
+    ]),
+    # Expired leases and cool-downs are also ignored by every query; the TTL monitor just cleans up
+    (leases_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ]),
+    (session_cooldowns_collection, [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ]),
+]
+
+
+def _query_shapes() -> List[Dict[str, Any]]:
+    """Representative queries the API issues, checked against their winning plans."""
+    shapes = [
+        {
+            "name": "filter_creators",
+            "collection": creators_collection,
+            "filter": {"follower_count": {"$gte": 1000, "$lte": 100000}},
+        },
+        {
+            "name": "filter_creators_location",
+            "collection": creators_collection,
+            "filter": {"follower_count": {"$gte": 1000, "$lte": 100000}, "location_tokens": {"$all": ["mumbai"]}},
+        },
+        {
+            "name": "filter_creators_account_type",
+            "collection": creators_collection,
+            "filter": {"follower_count": {"$gte": 1000, "$lte": 100000}, "account_type": "Business"},
+        },
+        {
+            "name": "freshness_lookup",
+            "collection": creators_collection,
+            "filter": {"username": {"$in": ["a", "b"]}, **fresh_filter()},
+        },
+        {
+            "name": "last_scraped_before",
+            "collection": creators_collection,
+            "filter": {"scraped_at": {"$lt": freshness_cutoff()}},
+        },
+        {
+            "name": "refresh_candidates",
+            "collection": creators_collection,
+            "filter": {"scraped_at": {"$lt": freshness_cutoff()}, "follower_count": {"$gte": 100000, "$lt": 1000000}},
+            "sort": [("scraped_at", ASCENDING)],
+        },
+        {
+            "name": "pending_job_rows",
+            "collection": job_rows_collection,
+            "filter": {"job_id": None, "status": "pending"},
+            "sort": [("row_index", ASCENDING)],
+        },
+        {
+            "name": "expired_job_claims",
+            "collection": job_rows_collection,
+            "filter": {"status": "claimed", "claim_expires": {"$lt": freshness_cutoff()}},
+        },
+    ]
+    for field in SORTABLE_FIELDS:
+        shapes.append({
+            "name": f"list_creators_{field}",
+            "collection": creators_collection,
+            "filter": {},
+            "sort": [(field, DESCENDING), ("username", DESCENDING)],
+        })
+    return shapes
+
+
+async def ensure_indexes():
+    """
+    Creates every index the API relies on (no-op for indexes that already exist).
+    """
+    for collection, models in INDEXES:
+        # One index per call: a unique index that fails on existing duplicates must not
+        # take the query indexes of the same collection down with it
+        names = []
+        for model in models:
+            try:
+                names.extend(await collection.create_indexes([model]))
+            except OperationFailure as e:
+                name = model.document["name"]
+                logger.error(f"Could not create index {name} on {collection.name}: {e}")
+                if name == "username_unique":
+                    logger.error("Run `python -m database.migrations dedupe-usernames` and restart")
+        logger.info(f"Indexes ensured on {collection.name}: {', '.join(names)}")
+
+
+def _has_collscan(plan: Any) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collscan(v) for v in plan)
+    return False
+
+
+async def check_query_plans() -> List[str]:
+    """
+    Explains each known query shape and reports the ones that fall back to COLLSCAN.
+
+    Returns:
+        list: Names of the query shapes whose winning plan scans the collection.
+
+    Raises:
+        RuntimeError: If INDEX_PLAN_CHECK is "fail" and any shape scans the collection.
+    """
+    if INDEX_PLAN_CHECK == "off":
+        return []
+
+    offenders = []
+    for shape in _query_shapes():
+        cursor = shape["collection"].find(shape["filter"])
+        if shape.get("sort"):
+            cursor = cursor.sort(shape["sort"])
+        explained = await cursor.explain()
+        winning_plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+        if _has_collscan(winning_plan):
+            offenders.append(shape["name"])
+            logger.warning(f"Query shape '{shape['name']}' uses a COLLSCAN: {winning_plan}")
+
+    if offenders and INDEX_PLAN_CHECK == "fail":
+        raise RuntimeError(f"Query shapes without index support: {', '.join(offenders)}")
+    return offenders
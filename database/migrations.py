@@ -0,0 +1,152 @@
+"""
+One-shot data migrations. Run with:
+
+    python -m database.migrations location-tokens
+    python -m database.migrations scraped-at
+    python -m database.migrations dedupe-usernames
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+
+from pymongo import UpdateOne, DeleteMany, ASCENDING, DESCENDING
+
+from database.mongo import creators_collection
+from database.search import location_tokens
+from database.freshness import as_utc
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 1000
+
+
+async def backfill_location_tokens(batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """
+    Adds `location_tokens` to creators written before the indexed location search.
+
+    Returns:
+        int: Number of documents updated.
+    """
+    updated = 0
+    batch = []
+    cursor = creators_collection.find(
+        {"location_tokens": {"$exists": False}},
+        {"bio": 1, "location": 1},
+    ).batch_size(batch_size)
+    async for doc in cursor:
+        batch.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"location_tokens": location_tokens(doc.get("bio"), doc.get("location"))}},
+        ))
+        if len(batch) >= batch_size:
+            await creators_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            logger.info(f"location_tokens: {updated} documents updated")
+            batch = []
+    if batch:
+        await creators_collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+
+async def migrate_scraped_at(batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """
+    Rewrites ISO-string `scraped_at` values as native BSON datetimes.
+
+    Walks matching documents in _id order one batch at a time, so it can be
+    interrupted and re-run safely. Unparseable values are logged and left alone.
+
+    Returns:
+        int: Number of documents updated.
+    """
+    updated = 0
+    last_id = None
+    while True:
+        query = {"scraped_at": {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        docs = await creators_collection.find(query, {"scraped_at": 1}) \
+            .sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            break
+        last_id = docs[-1]["_id"]
+
+        batch = []
+        for doc in docs:
+            try:
+                scraped_at = as_utc(datetime.fromisoformat(doc["scraped_at"]))
+            except ValueError:
+                logger.warning(f"scraped_at: cannot parse {doc['scraped_at']!r} on {doc['_id']}")
+                continue
+            batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"scraped_at": scraped_at}}))
+        if batch:
+            await creators_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            logger.info(f"scraped_at: {updated} documents updated")
+    return updated
+
+
+async def dedupe_usernames(batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """
+    Collapses creators that share a username (ignoring case) into one lowercase document.
+
+    Needed before `username_unique` can be built on data written by the old
+    case-sensitive upserts. The most recently scraped document of each group is
+    kept; the others are deleted.
+
+    Returns:
+        int: Number of documents deleted.
+    """
+    deleted = 0
+    batch = []
+    cursor = creators_collection.aggregate([
+        {"$match": {"username": {"$type": "string"}}},
+        {"$sort": {"scraped_at": DESCENDING, "_id": DESCENDING}},
+        {"$group": {
+            "_id": {"$toLower": "$username"},
+            "ids": {"$push": "$_id"},
+            "usernames": {"$push": "$username"},
+        }},
+        {"$match": {"$expr": {"$or": [
+            {"$gt": [{"$size": "$ids"}, 1]},
+            {"$ne": [{"$first": "$usernames"}, "$_id"]},
+        ]}}},
+    ], allowDiskUse=True)
+    async for group in cursor:
+        keep, duplicates = group["ids"][0], group["ids"][1:]
+        if duplicates:
+            batch.append(DeleteMany({"_id": {"$in": duplicates}}))
+            deleted += len(duplicates)
+        if group["usernames"][0] != group["_id"]:
+            batch.append(UpdateOne({"_id": keep}, {"$set": {"username": group["_id"]}}))
+        if len(batch) >= batch_size:
+            # Deletes before the renames: ordered, so a lowercase rename never collides
+            await creators_collection.bulk_write(batch, ordered=True)
+            logger.info(f"dedupe-usernames: {deleted} documents deleted")
+            batch = []
+    if batch:
+        await creators_collection.bulk_write(batch, ordered=True)
+    return deleted
+
+
+MIGRATIONS = {
+    "location-tokens": backfill_location_tokens,
+    "scraped-at": migrate_scraped_at,
+    "dedupe-usernames": dedupe_usernames,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a one-shot data migration.")
+    parser.add_argument("migration", choices=sorted(MIGRATIONS))
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    updated = asyncio.run(MIGRATIONS[args.migration](batch_size=args.batch_size))
+    logger.info(f"{args.migration}: done, {updated} documents updated")
+
+
+if __name__ == "__main__":
+    main()
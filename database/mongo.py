@@ -1,12 +1,103 @@
+import asyncio
 import os
-from pymongo import MongoClient
+from typing import Optional
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+from metrics import mongo_listener
 
-load_dotenv()   
+load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
-client = AsyncIOMotorClient(MONGO_URI)
-db = client["instagram_scraper"]
-creators_collection = db["creators"]
-users_collection = db["users"]
+DB_NAME = "instagram_scraper"
+# Bound on the startup ping, so an unreachable cluster marks /health unready instead of hanging boot
+MONGO_PING_TIMEOUT = float(os.getenv("MONGO_PING_TIMEOUT", "5"))
+
+# Created by connect() from the FastAPI lifespan; scripts that skip it connect on first query
+client = None
+db = None
+
+
+def connect(uri: Optional[str] = None, motor_client=None):
+    """
+    Creates the Motor client (Motor/PyMongo are imported here, not at module import).
+
+    Args:
+        uri (str, optional): Overrides MONGO_URI.
+        motor_client (optional): An already built client to use instead (e.g. mongomock-motor in the bench).
+    """
+    global client, db
+    if motor_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        # tz_aware: datetimes (scraped_at, job timestamps) come back as UTC-aware values
+        # event_listeners: per-collection command latency for /metrics
+        motor_client = AsyncIOMotorClient(uri or MONGO_URI, tz_aware=True, event_listeners=[mongo_listener])
+    client = motor_client
+    db = client[DB_NAME]
+    for collection in registered_collections:
+        collection._target = None
+    return client
+
+
+def get_db():
+    if db is None:
+        connect()
+    return db
+
+
+async def ping(timeout: float = MONGO_PING_TIMEOUT):
+    """Round-trips to the server; raises if it cannot be reached within `timeout` seconds."""
+    await asyncio.wait_for(get_db().command("ping"), timeout)
+
+
+def close():
+    global client, db
+    if client is not None:
+        client.close()
+    client = db = None
+    for collection in registered_collections:
+        collection._target = None
+
+
+class LazyCollection:
+    """
+    Module-level handle for a collection that resolves against the current client on first use.
+
+    Other modules import these at import time (`from database.mongo import creators_collection`),
+    before any client exists; every attribute access is forwarded to the real Motor collection.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = get_db()[self.name]
+        return self._target
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+registered_collections = []
+
+
+def _collection(name: str) -> LazyCollection:
+    collection = LazyCollection(name)
+    registered_collections.append(collection)
+    return collection
+
+
+creators_collection = _collection("creators")
+users_collection = _collection("users")
+jobs_collection = _collection("jobs")
+job_rows_collection = _collection("job_rows")
+sessions_collection = _collection("sessions")
+refresh_budget_collection = _collection("refresh_budget")
+follower_history_collection = _collection("follower_history")
+# Cross-process coordination (scraper/coordination.py)
+rate_limits_collection = _collection("rate_limits")
+leases_collection = _collection("leases")
+session_cooldowns_collection = _collection("session_cooldowns")
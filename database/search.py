@@ -0,0 +1,33 @@
+import re
+import unicodedata
+from typing import List, Optional
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Splits free text into lowercase, accent-folded word tokens.
+
+    Args:
+        text (str): Any text, e.g. a bio or a location search term.
+
+    Returns:
+        list: Unique tokens in first-seen order.
+    """
+    if not text:
+        return []
+    folded = "".join(c for c in unicodedata.normalize("NFKD", str(text)) if not unicodedata.combining(c))
+    seen = {}
+    for token in _TOKEN_RE.findall(folded.lower()):
+        seen.setdefault(token, None)
+    return list(seen)
+
+
+def location_tokens(bio: Optional[str] = None, location: Optional[str] = None) -> List[str]:
+    """
+    Tokens stored on each creator for the indexed location search.
+
+    Replaces the case-insensitive $regex over bio/location, which can't use an index.
+    """
+    return list(dict.fromkeys(tokenize(location) + tokenize(bio)))
@@ -31,41 +31,63 @@ export default function CreatorsPage() {
   const [sortField, setSortField] = useState<'follower_count' | 'following_count' | 'avg_reel_views' | 'avg_story_views'>('follower_count');
   const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('desc');
 
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Filtering, sorting and pagination happen server-side on /creators/all
+  const fetchPage = async (cursor: string | null) => {
+    const base = process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:8000';
+    const params = new URLSearchParams({
+      sort_by: sortField,
+      order: sortOrder,
+      limit: '50',
+    });
+    if (minFollowers > 0) params.set('min_followers', String(minFollowers));
+    if (maxFollowers !== Number.MAX_SAFE_INTEGER) params.set('max_followers', String(maxFollowers));
+    if (minReelViews > 0) params.set('min_reel_views', String(minReelViews));
+    if (minStoryViews > 0) params.set('min_story_views', String(minStoryViews));
+    if (cursor) params.set('cursor', cursor);
+
+    const res = await fetch(`${base}/creators/all?${params.toString()}`);
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    return (await res.json()) as { items: Creator[]; next_cursor: string | null };
+  };
+
   useEffect(() => {
+    let cancelled = false;
     const fetchCreators = async () => {
+      setLoading(true);
+      setFetchError(null);
       try {
-        const base = process.env.NEXT_PUBLIC_API_BASE || 'http://localhost:8000';
-        const url = `${base}/creators/all`;
-        const res = await fetch(url);
-        if (!res.ok) throw new Error(`HTTP ${res.status}`);
-        const data: Creator[] = await res.json();
-        setCreators(data);
+        const page = await fetchPage(null);
+        if (cancelled) return;
+        setCreators(page.items);
+        setNextCursor(page.next_cursor);
       } catch (err: any) {
-        setFetchError(err.message || 'Unknown error');
+        if (!cancelled) setFetchError(err.message || 'Unknown error');
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
     fetchCreators();
-  }, []);
+    return () => { cancelled = true; };
+  }, [minFollowers, maxFollowers, minReelViews, minStoryViews, sortField, sortOrder]);
 
-  // Apply filters
-  const filtered = creators.filter(c =>
-    c.follower_count >= minFollowers &&
-    c.follower_count <= maxFollowers &&
-    c.avg_reel_views >= minReelViews &&
-    c.avg_story_views >= minStoryViews
-  );
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setCreators(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err: any) {
+      setFetchError(err.message || 'Unknown error');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
-  // Apply sorting
-  const sorted = [...filtered].sort((a, b) => {
-    const diff = a[sortField] - b[sortField];
-    return sortOrder === 'asc' ? diff : -diff;
-  });
-
-  if (loading) return <p className="p-8">Loading creators…</p>;
   if (fetchError) return <p className="p-8 text-red-600">Error: {fetchError}</p>;
-  if (!creators.length) return <p className="p-8">No creators found.</p>;
 
   return (
     <main className="p-8">
@@ -135,9 +157,12 @@ export default function CreatorsPage() {
         </div>
       </div>
 
+      {loading && <p>Loading creators…</p>}
+      {!loading && !creators.length && <p>No creators found.</p>}
+
       {/* List View */}
       <ul className="divide-y">
-        {sorted.map((c, i) => (
+        {creators.map((c, i) => (
           <li key={i} className="py-4 flex items-center space-x-4">
             <img
               src={c.profile_pic_url}
@@ -155,15 +180,25 @@ export default function CreatorsPage() {
                 {c.username}
               </a>
               <div className="text-sm text-gray-600 mt-1">
-                Followers: {c.follower_count.toLocaleString()} •
-                Following: {c.following_count.toLocaleString()} •
-                Reel Avg: {c.avg_reel_views.toLocaleString()} •
-                Story Avg: {c.avg_story_views.toLocaleString()}
+                Followers: {(c.follower_count ?? 0).toLocaleString()} •
+                Following: {(c.following_count ?? 0).toLocaleString()} •
+                Reel Avg: {(c.avg_reel_views ?? 0).toLocaleString()} •
+                Story Avg: {(c.avg_story_views ?? 0).toLocaleString()}
               </div>
             </div>
           </li>
         ))}
       </ul>
+
+      {nextCursor && (
+        <button
+          onClick={loadMore}
+          disabled={loadingMore}
+          className="mt-6 border px-4 py-2 rounded"
+        >
+          {loadingMore ? 'Loading…' : 'Load more'}
+        </button>
+      )}
     </main>
   );
 }
@@ -14,9 +14,10 @@ export default function Dashboard() {
     }
     setUserEmail('user@example.com');
 
-    fetch(`${process.env.NEXT_PUBLIC_API_BASE}/creators/all`)
+    // /creators/all is keyset-paginated: { items, next_cursor }
+    fetch(`${process.env.NEXT_PUBLIC_API_BASE}/creators/all?limit=50`)
       .then((res) => res.json())
-      .then(setCreators);
+      .then((page) => setCreators(page.items ?? []));
   }, []);
 
   return (
@@ -1,15 +1,115 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import sys
 import asyncio
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from api.endpoints import router as creators_router
-from api.auth import router as auth_router
+from api.auth import router as auth_router, auth_cache
+from api.cache import read_cache
+from api.responses import FastJSONResponse
+from metrics import HTTP_REQUEST_SECONDS, stats_collector, loop_lag_monitor
+from scraper.worker import instagram_scraper
+from scraper.scheduler import scrape_scheduler
+from scraper.sessions import session_pool
+from session_manager import browser_pool
+from api.jobs import job_runner
+from api.refresher import creator_refresher
+from database.indexes import ensure_indexes, check_query_plans
+from database import mongo
+from startup import startup_profile
+
+logger = logging.getLogger(__name__)
 
 # ✅ Fix for Playwright subprocess issue on Windows
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients and scraper state are built here rather than at import, and each
+    # step is timed and reported through /health and /health/startup
+    async with startup_profile.phase("loop_lag_monitor", required=False):
+        await loop_lag_monitor.start()
+
+    mongo_ready = True
+    try:
+        async with startup_profile.phase("mongo"):
+            if mongo.client is None:
+                mongo.connect()
+            await mongo.ping()
+    except Exception:
+        mongo_ready = False
+        logger.exception("MongoDB is unreachable; /health reports the API as unavailable")
+
+    if mongo_ready:
+        try:
+            async with startup_profile.phase("indexes", required=False):
+                await ensure_indexes()
+                await check_query_plans()
+        except RuntimeError:
+            raise
+        except Exception:
+            logger.exception("Index provisioning failed; continuing without it")
+    else:
+        startup_profile.skip("indexes", "MongoDB unreachable", required=False)
+
+    async with startup_profile.phase("sessions"):
+        await session_pool.reload()
+    # Warm the shared scraper HTTP client once and release its pooled connections on shutdown
+    async with startup_profile.phase("scraper"):
+        await instagram_scraper.start()
+    async with startup_profile.phase("scheduler"):
+        await scrape_scheduler.start()
+    async with startup_profile.phase("jobs"):
+        await job_runner.start()
+    async with startup_profile.phase("refresher"):
+        await creator_refresher.start()
+    startup_profile.finish()
+    try:
+        yield
+    finally:
+        await creator_refresher.close()
+        await job_runner.close()
+        await scrape_scheduler.close()
+        await instagram_scraper.close()
+        await browser_pool.close()
+        await loop_lag_monitor.close()
+        mongo.close()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+stats_collector.register("scheduler", scrape_scheduler.stats)
+stats_collector.register("caches", lambda: {"read": read_cache.stats(), "auth": auth_cache.stats()})
+stats_collector.register("sessions", session_pool.stats)
+
+CREATORS_PREFIX = "/creators"
+# FastAPI versions that don't copy included routes hand the router's own (unprefixed) route to the scope
+_ROUTE_PREFIXES = {id(route): CREATORS_PREFIX for route in creators_router.routes}
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, e.g. /creators/profile/{username}."""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    return _ROUTE_PREFIXES.get(id(route), "") + getattr(route, "path", "")
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.labels(
+            request.method, route_template(request), str(status)
+        ).observe(time.perf_counter() - started)
 app.include_router(auth_router)
 
 # ✅ CORS fix for Swagger UI
@@ -23,7 +123,7 @@ app.add_middleware(
 
 
 # Register API router
-app.include_router(creators_router, prefix="/creators", tags=["Creators"])
+app.include_router(creators_router, prefix=CREATORS_PREFIX, tags=["Creators"])
 
 @app.get("/")
 def read_root():
@@ -38,12 +138,26 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "message": "API is running smoothly."}
+    """Readiness: 200 once every required component started, 503 while starting or if one failed."""
+    ready, body = startup_profile.health()
+    body["message"] = "API is running smoothly." if ready else "API is not ready."
+    return FastJSONResponse(body, status_code=200 if ready else 503)
+
+@app.get("/health/startup")
+def startup_report():
+    """Import and lifespan phase timings for this process."""
+    return startup_profile.report()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/docs")
 def get_docs():
     return {"message": "API documentation is available at /docs."}
 
+startup_profile.record("imports", time.perf_counter() - _IMPORT_STARTED)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
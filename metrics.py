@@ -0,0 +1,174 @@
+# metrics.py (Prometheus metrics shared by the API, scraper and Mongo client)
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+# === Instruments ===
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+SCRAPE_SECONDS = Histogram(
+    "scrape_upstream_duration_seconds",
+    "Latency of one Instagram profile request",
+    ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30),
+)
+SCRAPE_RESPONSES = Counter(
+    "scrape_upstream_responses_total",
+    "Instagram profile responses by HTTP status (\"error\" for transport failures)",
+    ["status_code"],
+)
+MONGO_SECONDS = Histogram(
+    "mongo_command_duration_seconds",
+    "Mongo command latency by collection and command",
+    ["collection", "command", "outcome"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer that should have fired on time",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_LAG_LAST = Gauge("event_loop_lag_last_seconds", "Most recent event loop lag sample")
+STARTUP_PHASE_SECONDS = Gauge(
+    "startup_phase_duration_seconds",
+    "Time spent in each cold-start phase (module imports, then each lifespan step)",
+    ["phase"],
+)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Times every command sent by the Motor client.
+
+    Started events carry the collection name and succeeded/failed events carry
+    the duration, so the name is kept per (connection, request id) in between.
+    """
+
+    _SKIPPED = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions"}
+
+    def __init__(self):
+        self._collections: Dict[Any, str] = {}
+
+    def started(self, event):
+        if event.command_name in self._SKIPPED:
+            return
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else "-"
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), None)
+        if collection is None:
+            return
+        MONGO_SECONDS.labels(collection, event.command_name, outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+class StatsCollector:
+    """
+    Exposes the stats() of the scheduler, caches and session pool at scrape time.
+
+    Providers are registered by name from main.py so this module does not import
+    the components it reports on.
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]):
+        self._providers[name] = provider
+
+    def collect(self):
+        for name, provider in self._providers.items():
+            try:
+                stats = provider()
+            except Exception:
+                logger.exception(f"Stats provider {name} failed")
+                continue
+            yield from getattr(self, f"_collect_{name}")(stats)
+
+    def _collect_scheduler(self, stats):
+        depth = GaugeMetricFamily("scheduler_queue_depth", "Queued scrape jobs by lane", labels=["lane"])
+        for lane, value in stats["queue_depth"].items():
+            depth.add_metric([lane], value)
+        yield depth
+        yield GaugeMetricFamily("scheduler_in_flight", "Scrapes currently calling upstream", value=stats["in_flight"])
+        yield GaugeMetricFamily("scheduler_unique_in_flight", "Distinct usernames queued or running", value=stats["unique_in_flight"])
+        for key in ("completed", "failed", "retries", "coalesced", "negative_cache_hits"):
+            yield CounterMetricFamily(f"scheduler_{key}", f"Scheduler {key.replace('_', ' ')}", value=stats[key])
+        reasons = CounterMetricFamily("scheduler_failures_by_reason", "Scrapes given up on, by reason", labels=["reason"])
+        for reason, value in stats["failure_reasons"].items():
+            reasons.add_metric([reason], value)
+        yield reasons
+        tokens = GaugeMetricFamily("scheduler_tokens_available", "Rate limit tokens left per host", labels=["host"])
+        for host, value in stats["tokens_available"].items():
+            tokens.add_metric([host], value)
+        yield tokens
+        breaker = stats["circuit_breaker"]
+        yield GaugeMetricFamily("scheduler_circuit_open", "1 while the circuit breaker is not closed", value=int(breaker["state"] != "closed"))
+        yield CounterMetricFamily("scheduler_circuit_opened", "Times the circuit breaker opened", value=breaker["times_opened"])
+
+    def _collect_caches(self, caches):
+        # caches: {"read": ReadCache.stats(), "auth": ...}
+        for key, family in (("entries", GaugeMetricFamily), ("bytes", GaugeMetricFamily), ("hit_rate", GaugeMetricFamily),
+                            ("hits", CounterMetricFamily), ("misses", CounterMetricFamily), ("evictions", CounterMetricFamily),
+                            ("expirations", CounterMetricFamily), ("invalidations", CounterMetricFamily)):
+            metric = family(f"cache_{key}", f"Cache {key.replace('_', ' ')}", labels=["cache"])
+            for cache, stats in caches.items():
+                metric.add_metric([cache], stats[key])
+            yield metric
+
+    def _collect_sessions(self, stats):
+        yield GaugeMetricFamily("sessions_total", "Instagram sessions in the pool", value=stats["total"])
+        yield GaugeMetricFamily("sessions_available", "Sessions not cooling down", value=stats["available"])
+
+
+class LoopLagMonitor:
+    """Samples event loop lag by measuring how late a periodic sleep wakes up."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Shared instances
+mongo_listener = MongoCommandListener()
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,184 @@
+# coordination.py (Mongo-backed rate limit and leases shared by every API process)
+"""
+With `uvicorn --workers N` or several containers, anything kept in process
+memory is multiplied by the number of processes. When COORDINATION_ENABLED is
+set, the scraper instead draws upstream tokens from one bucket document,
+takes a lease per username before scraping, shares session cool-downs and
+elects one process to run the refresher. Bulk job rows are always claimed
+through Mongo (see api/jobs.py), so any process can work on any job.
+
+Every operation here fails open: if Mongo is unreachable a process falls back
+to its own pacing rather than stopping all scrapes.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from database.mongo import rate_limits_collection, leases_collection
+
+logger = logging.getLogger(__name__)
+
+COORDINATION_ENABLED = os.getenv("COORDINATION_ENABLED", "false").lower() in ("1", "true", "yes")
+# A lease not renewed for this long is free to take over (its holder is presumed dead)
+LEASE_TTL = float(os.getenv("LEASE_TTL", "120"))
+LEASE_POLL_INTERVAL = float(os.getenv("LEASE_POLL_INTERVAL", "0.5"))
+
+# Identifies this process in leases and job-row claims
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class MongoTokenBucket:
+    """
+    Token bucket kept in a single `rate_limits` document, so all processes share one budget.
+
+    Refill and take happen in one atomic pipeline update. Time comes from each
+    process's wall clock; a clock that runs behind never refills negatively.
+    Calls within one process are serialized, so each process has at most one
+    request waiting on Mongo.
+    """
+
+    def __init__(self, key: str, rate: float, capacity: int):
+        self.key = key
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.fallbacks = 0
+        self._lock = asyncio.Lock()
+
+    async def _take(self) -> Dict[str, Any]:
+        now = time.time()
+        elapsed = {"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}]}
+        refilled = {"$min": [
+            self.capacity,
+            {"$add": [{"$ifNull": ["$tokens", self.capacity]}, {"$multiply": [elapsed, self.rate]}]},
+        ]}
+        has_token = {"$gte": ["$tokens", 1]}
+        return await rate_limits_collection.find_one_and_update(
+            {"_id": self.key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": {"$max": [{"$ifNull": ["$updated_at", now]}, now]}}},
+                {"$set": {
+                    "granted": has_token,
+                    "tokens": {"$cond": [has_token, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                try:
+                    doc = await self._take()
+                except PyMongoError as e:
+                    # Keep scraping at this process's share of the rate rather than stall
+                    self.fallbacks += 1
+                    logger.warning(f"Shared rate limit {self.key} unavailable ({e}); pacing locally")
+                    await asyncio.sleep(1 / self.rate)
+                    return
+                self.tokens = doc["tokens"]
+                if doc["granted"]:
+                    return
+                await asyncio.sleep(max(0.01, (1 - self.tokens) / self.rate))
+
+    def available(self) -> float:
+        """Tokens left as of this process's last take (other processes may have used some since)."""
+        return round(self.tokens, 2)
+
+
+class LeaseManager:
+    """
+    Named, expiring locks in the `leases` collection.
+
+    A lease is held by one WORKER_ID until it is released or `expires_at`
+    passes; the TTL index only cleans up afterwards, expiry itself is checked
+    in every query. A released lease can carry a payload that stays readable
+    (and blocks new holders) for `keep` seconds, which is how a finished scrape
+    is handed to processes that were waiting for it.
+    """
+
+    def __init__(self, owner: str = WORKER_ID, ttl: float = LEASE_TTL):
+        self.owner = owner
+        self.ttl = ttl
+
+    async def acquire(self, key: str, ttl: Optional[float] = None) -> bool:
+        """
+        Takes the lease, or renews it when this process already holds it.
+
+        Returns:
+            bool: False when another process holds it or its payload is still fresh.
+            Mongo errors count as acquired, so an outage never blocks work.
+        """
+        now = _now()
+        try:
+            await leases_collection.update_one(
+                {"_id": key, "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {
+                    "$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=ttl or self.ttl), "acquired_at": now},
+                    "$unset": {"payload": ""},
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+        except PyMongoError as e:
+            logger.warning(f"Could not take lease {key} ({e}); proceeding without it")
+            return True
+
+    async def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """The unexpired lease document, if any."""
+        try:
+            return await leases_collection.find_one({"_id": key, "expires_at": {"$gt": _now()}})
+        except PyMongoError:
+            return None
+
+    async def release(self, key: str, payload: Optional[Dict[str, Any]] = None, keep: float = 0):
+        """
+        Gives the lease up, optionally leaving `payload` readable for `keep` seconds.
+        """
+        try:
+            if payload is None or keep <= 0:
+                await leases_collection.delete_one({"_id": key, "owner": self.owner})
+                return
+            await leases_collection.update_one(
+                {"_id": key, "owner": self.owner},
+                {"$set": {"owner": None, "payload": payload, "expires_at": _now() + timedelta(seconds=keep)}},
+            )
+        except PyMongoError:
+            logger.exception(f"Could not release lease {key}; it expires on its own")
+
+    @asynccontextmanager
+    async def keepalive(self, key: str, ttl: Optional[float] = None):
+        """Renews a held lease in the background while the block runs."""
+        ttl = ttl or self.ttl
+
+        async def renew():
+            while True:
+                await asyncio.sleep(ttl / 3)
+                await self.acquire(key, ttl)
+
+        task = asyncio.create_task(renew(), name=f"lease-{key}")
+        try:
+            yield
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+# Shared instance
+lease_manager = LeaseManager()
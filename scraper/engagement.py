@@ -0,0 +1,78 @@
+# engagement.py (engagement metrics from the recent posts embedded in web_profile_info)
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+SECONDS_PER_WEEK = 7 * 24 * 3600
+
+
+def _count(node: Dict[str, Any], *edges: str) -> Optional[int]:
+    # Hidden like counts come back missing or negative; treat both as unknown
+    for edge in edges:
+        value = (node.get(edge) or {}).get("count")
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+            return int(value)
+    return None
+
+
+def engagement_metrics(user: Dict[str, Any], follower_count: int) -> Dict[str, Any]:
+    """
+    Engagement of a profile from the media edges already in its web_profile_info payload.
+
+    Instagram embeds the latest posts (usually 12) in `edge_owner_to_timeline_media`;
+    every figure is taken from those in one pass, without another request.
+
+    Args:
+        user (dict): `data.user` of the web_profile_info response.
+        follower_count (int): The profile's follower count.
+
+    Returns:
+        dict: media_count, recent_posts, avg_likes, avg_comments, avg_video_views,
+        engagement_rate (average likes + comments per post as a % of followers),
+        posts_per_week and last_post_at. A figure is None when no post supports it.
+    """
+    media = user.get("edge_owner_to_timeline_media") or {}
+    posts = likes = comments = 0
+    videos = views = 0
+    newest = oldest = None
+    dated = 0
+
+    for edge in media.get("edges") or []:
+        node = edge.get("node") or {}
+        post_likes = _count(node, "edge_liked_by", "edge_media_preview_like")
+        post_comments = _count(node, "edge_media_to_comment", "edge_media_preview_comment")
+        if post_likes is None and post_comments is None:
+            continue
+        posts += 1
+        likes += post_likes or 0
+        comments += post_comments or 0
+
+        video_views = node.get("video_view_count")
+        if node.get("is_video") and isinstance(video_views, (int, float)):
+            videos += 1
+            views += video_views
+
+        taken_at = node.get("taken_at_timestamp")
+        if isinstance(taken_at, (int, float)):
+            dated += 1
+            newest = taken_at if newest is None else max(newest, taken_at)
+            oldest = taken_at if oldest is None else min(oldest, taken_at)
+
+    avg_likes = round(likes / posts, 2) if posts else None
+    avg_comments = round(comments / posts, 2) if posts else None
+    engagement_rate = None
+    if posts and follower_count:
+        engagement_rate = round(100 * (likes + comments) / posts / follower_count, 4)
+    posts_per_week = None
+    if dated >= 2 and newest > oldest:
+        posts_per_week = round((dated - 1) / ((newest - oldest) / SECONDS_PER_WEEK), 3)
+
+    return {
+        "media_count": media.get("count"),
+        "recent_posts": posts,
+        "avg_likes": avg_likes,
+        "avg_comments": avg_comments,
+        "avg_video_views": round(views / videos, 2) if videos else None,
+        "engagement_rate": engagement_rate,
+        "posts_per_week": posts_per_week,
+        "last_post_at": datetime.fromtimestamp(newest, timezone.utc) if newest is not None else None,
+    }
@@ -0,0 +1,541 @@
+# scheduler.py (bounded-concurrency front door for scrape_profile)
+import asyncio
+import itertools
+import logging
+import os
+import random
+import time
+from collections import Counter, deque
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+from scraper.worker import scrape_profile, ScrapeFailed, ProfileUnavailable, FAILURE_CIRCUIT_OPEN
+from scraper.sessions import session_pool, SessionPool
+from scraper.coordination import (
+    COORDINATION_ENABLED, LEASE_POLL_INTERVAL, MongoTokenBucket, LeaseManager, lease_manager,
+)
+
+logger = logging.getLogger(__name__)
+
+# === Scheduler Tuning ===
+# SCRAPE_RATE_PER_SECOND applies per usable session, so throughput grows with the pool
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "8"))
+SCRAPE_RATE_PER_SECOND = float(os.getenv("SCRAPE_RATE_PER_SECOND", "2"))
+SCRAPE_RATE_BURST = int(os.getenv("SCRAPE_RATE_BURST", "5"))
+NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", "120"))
+# Upper bound on remembered missing profiles; expired entries are swept first, then the oldest go
+NEGATIVE_CACHE_MAX = int(os.getenv("NEGATIVE_CACHE_MAX", "10000"))
+# With coordination, a finished scrape is handed to other processes asking within this window
+SHARED_RESULT_TTL = float(os.getenv("SHARED_RESULT_TTL", "30"))
+
+# === Retry / Circuit Breaker ===
+SCRAPE_MAX_ATTEMPTS = int(os.getenv("SCRAPE_MAX_ATTEMPTS", "4"))
+# Interactive scrapes hold an HTTP request open, so they retry less and never wait out the breaker
+SCRAPE_INTERACTIVE_ATTEMPTS = int(os.getenv("SCRAPE_INTERACTIVE_ATTEMPTS", "2"))
+SCRAPE_BACKOFF_BASE = float(os.getenv("SCRAPE_BACKOFF_BASE", "1"))
+SCRAPE_BACKOFF_MAX = float(os.getenv("SCRAPE_BACKOFF_MAX", "60"))
+BREAKER_WINDOW = float(os.getenv("BREAKER_WINDOW", "60"))
+BREAKER_MIN_REQUESTS = int(os.getenv("BREAKER_MIN_REQUESTS", "10"))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+BREAKER_MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", "600"))
+
+INSTAGRAM_API_HOST = "i.instagram.com"
+
+# Lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+PRIORITY_BACKGROUND = 20
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk", PRIORITY_BACKGROUND: "background"}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second refill up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def available(self) -> float:
+        self._refill()
+        return round(self.tokens, 2)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(SCRAPE_BACKOFF_MAX, SCRAPE_BACKOFF_BASE * (2 ** (attempt - 1))))
+    if retry_after:
+        delay = max(delay, min(retry_after, SCRAPE_BACKOFF_MAX))
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Pauses every scrape when upstream keeps failing.
+
+    Outcomes from the last `window` seconds are kept; once at least `min_requests`
+    were seen and the failure share reaches `error_rate`, the breaker opens for
+    `cooldown` seconds (or the upstream Retry-After, if longer). After that a
+    single probe request is let through: success closes the breaker, failure
+    reopens it with a doubled cool-down.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        window: float = BREAKER_WINDOW,
+        min_requests: int = BREAKER_MIN_REQUESTS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+        probe_timeout: float = 30.0,
+    ):
+        self.window = window
+        self.min_requests = max(1, min_requests)
+        self.error_rate = error_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.state = self.CLOSED
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self.opened = 0
+        self._outcomes: deque = deque()
+        self._probe_started = 0.0
+
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self, now: float, retry_after: Optional[float]):
+        self.state = self.OPEN
+        self.open_until = now + max(self.cooldown, retry_after or 0)
+        self.opened += 1
+        self._outcomes.clear()
+        logger.warning(f"Circuit breaker open for {self.open_until - now:.1f}s")
+
+    def try_pass(self) -> Optional[float]:
+        """
+        Non-blocking wait(): lets the caller through (possibly as the half-open probe).
+
+        Returns:
+            float | None: None if the caller may go ahead, else seconds until it might.
+        """
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            return None
+        if self.state == self.OPEN:
+            if now < self.open_until:
+                return self.open_until - now
+            self.state = self.HALF_OPEN
+            self._probe_started = 0.0
+        if not self._probe_started or now - self._probe_started > self.probe_timeout:
+            self._probe_started = now
+            return None
+        return self.probe_timeout - (now - self._probe_started)
+
+    async def wait(self):
+        """Blocks while the breaker is open or another caller is probing."""
+        while True:
+            delay = self.try_pass()
+            if delay is None:
+                return
+            # While half-open, check back often: the probe usually settles it quickly
+            await asyncio.sleep(delay if self.state == self.OPEN else 0.5)
+
+    def record(self, ok: bool, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            if ok:
+                logger.info("Circuit breaker closed")
+                self.state = self.CLOSED
+                self.cooldown = self.base_cooldown
+            else:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open(now, retry_after)
+            return
+        if self.state == self.OPEN:
+            return
+        self._outcomes.append((now, ok))
+        self._prune(now)
+        failures = sum(1 for _, good in self._outcomes if not good)
+        if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.error_rate:
+            self._open(now, retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._prune(now)
+        return {
+            "state": self.state,
+            "open_seconds_left": round(max(0.0, self.open_until - now), 1) if self.state == self.OPEN else 0.0,
+            "window_requests": len(self._outcomes),
+            "window_failures": sum(1 for _, good in self._outcomes if not good),
+            "times_opened": self.opened,
+        }
+
+
+def normalize_username(username: str) -> str:
+    return username.strip().lstrip("@").lower()
+
+
+class _Flight:
+    """One outstanding scrape shared by every caller asking for the same username."""
+
+    __slots__ = ("future", "priority", "max_attempts", "waiters", "started")
+
+    def __init__(self, future: asyncio.Future, priority: int, max_attempts: int):
+        self.future = future
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.waiters = 0
+        self.started = False
+
+
+class ScrapeScheduler:
+    """
+    Runs scrape jobs through a fixed pool of workers.
+
+    Retryable failures (rate limits, expired sessions, network and 5xx errors)
+    are retried with jittered exponential backoff, and a shared circuit breaker
+    stops all workers while upstream is failing.
+
+    Jobs wait in a priority queue (interactive, bulk, then background), each worker takes a token
+    from the per-host bucket before calling upstream, and at most `max_concurrency`
+    scrapes are in flight at any time. The bucket refills at `rate_per_second` for
+    every session in the pool that is not cooling down.
+
+    With `leases`, a username is scraped by one process at a time and waiting
+    processes take the holder's result; with `shared_rate_limit`, the bucket
+    lives in Mongo and is shared by every process.
+    """
+
+    def __init__(
+        self,
+        scrape_fn: Callable[..., Awaitable[Optional[Dict[str, Any]]]],
+        max_concurrency: int = SCRAPE_MAX_CONCURRENCY,
+        rate_per_second: float = SCRAPE_RATE_PER_SECOND,
+        burst: int = SCRAPE_RATE_BURST,
+        sessions: Optional[SessionPool] = None,
+        max_attempts: int = SCRAPE_MAX_ATTEMPTS,
+        leases: Optional[LeaseManager] = None,
+        shared_rate_limit: bool = False,
+    ):
+        self.scrape_fn = scrape_fn
+        self.sessions = sessions
+        self.max_attempts = max(1, max_attempts)
+        self.breaker = CircuitBreaker()
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.leases = leases
+        self.shared_rate_limit = shared_rate_limit
+        self._buckets: Dict[str, Any] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers = []
+        self._seq = itertools.count()
+        self._queued = {lane: 0 for lane in LANE_NAMES}
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._negative: Dict[str, Tuple[float, str]] = {}
+        self._coalesced = 0
+        self._negative_hits = 0
+        self._retries = 0
+        self._failure_reasons: Counter = Counter()
+        self._shared_results = 0
+
+    def _bucket(self, host: str):
+        if host not in self._buckets:
+            if self.shared_rate_limit:
+                self._buckets[host] = MongoTokenBucket(f"scrape:{host}", self.rate_per_second, self.burst)
+            else:
+                self._buckets[host] = TokenBucket(self.rate_per_second, self.burst)
+        bucket = self._buckets[host]
+        if self.sessions is not None:
+            bucket.rate = self.rate_per_second * max(1, self.sessions.healthy_count())
+        return bucket
+
+    async def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"scrape-worker-{i}")
+            for i in range(self.max_concurrency)
+        ]
+
+    async def close(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, _, _, _, flight = self._queue.get_nowait()
+                if not flight.future.done():
+                    flight.future.cancel()
+        self._queue = None
+        self._queued = {lane: 0 for lane in LANE_NAMES}
+
+    async def submit(
+        self,
+        username: str,
+        login_credentials: Optional[Dict[str, str]] = None,
+        priority: int = PRIORITY_BULK,
+        host: str = INSTAGRAM_API_HOST,
+        max_attempts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Queues a scrape and waits for its result.
+
+        Concurrent calls for the same username share one upstream request, and a
+        username that was just reported missing is answered from the negative
+        cache for NEGATIVE_CACHE_TTL seconds.
+
+        Args:
+            username (str): Instagram username to scrape.
+            login_credentials (dict, optional): Passed through to the scrape function.
+            priority (int): PRIORITY_INTERACTIVE, PRIORITY_BULK or PRIORITY_BACKGROUND.
+            host (str): Upstream host whose rate limit applies.
+            max_attempts (int, optional): Upstream attempts for this scrape (defaults to the
+                scheduler's max_attempts); a shared scrape makes as many as its most demanding caller.
+
+        Returns:
+            dict: The scraped profile (a copy per caller, safe to modify).
+
+        Raises:
+            ProfileUnavailable: The profile does not exist (possibly answered from the negative cache).
+            ScrapeFailed: Every attempt failed; `reason` holds the last failure class.
+                Interactive callers get FAILURE_CIRCUIT_OPEN (with retry_after) instead of
+                waiting while the breaker is open.
+        """
+        if not self._workers:
+            await self.start()
+        priority = priority if priority in LANE_NAMES else PRIORITY_BULK
+        key = normalize_username(username)
+        if priority == PRIORITY_INTERACTIVE:
+            max_attempts = max_attempts or min(self.max_attempts, SCRAPE_INTERACTIVE_ATTEMPTS)
+        max_attempts = max(1, max_attempts or self.max_attempts)
+
+        negative = self._negative.get(key)
+        if negative is not None:
+            expires_at, reason = negative
+            if expires_at > time.monotonic():
+                self._negative_hits += 1
+                raise ProfileUnavailable(username, reason)
+            del self._negative[key]
+
+        if priority == PRIORITY_INTERACTIVE and self.breaker.state == CircuitBreaker.OPEN:
+            remaining = self.breaker.open_until - time.monotonic()
+            if remaining > 0:
+                raise ScrapeFailed(username, FAILURE_CIRCUIT_OPEN, retry_after=remaining)
+
+        flight = self._flights.get(key)
+        requeue = False
+        if flight is None:
+            flight = _Flight(asyncio.get_running_loop().create_future(), priority, max_attempts)
+            self._flights[key] = flight
+            flight.future.add_done_callback(lambda _: self._land(key, flight))
+            requeue = True
+        else:
+            self._coalesced += 1
+            if not flight.started:
+                flight.max_attempts = max(flight.max_attempts, max_attempts)
+            if priority < flight.priority and not flight.started:
+                # An interactive caller joined a queued bulk scrape: queue it again in the fast lane
+                flight.priority = priority
+                requeue = True
+
+        flight.waiters += 1
+        try:
+            if requeue:
+                # Upstream sees the normalized name, so "@Name" and "name" are one profile
+                await self._enqueue(priority, host, key, login_credentials, flight)
+            # Coalesced callers share one result; each gets its own dict to update
+            return dict(await asyncio.shield(flight.future))
+        except asyncio.CancelledError:
+            # Only give up the upstream request once nobody is waiting for it
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.started and not flight.future.done():
+                flight.future.cancel()
+            raise
+
+    def _remember_missing(self, username: str, reason: str):
+        now = time.monotonic()
+        key = normalize_username(username)
+        self._negative.pop(key, None)
+        if len(self._negative) >= NEGATIVE_CACHE_MAX:
+            self._negative = {k: v for k, v in self._negative.items() if v[0] > now}
+            while len(self._negative) >= NEGATIVE_CACHE_MAX:
+                # Entries share one TTL, so insertion order is expiry order
+                del self._negative[next(iter(self._negative))]
+        self._negative[key] = (now + NEGATIVE_CACHE_TTL, reason)
+
+    def _land(self, key: str, flight: "_Flight"):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _enqueue(self, priority, host, username, login_credentials, flight: "_Flight"):
+        self._queued[priority] += 1
+        await self._queue.put((priority, next(self._seq), host, username, login_credentials, flight))
+
+    async def _worker(self):
+        while True:
+            priority, _, host, username, login_credentials, flight = await self._queue.get()
+            self._queued[priority] -= 1
+            future = flight.future
+            try:
+                # Every caller went away, or a faster-lane copy of this job already ran
+                if future.done() or flight.started:
+                    continue
+                flight.started = True
+                try:
+                    fail_fast = flight.priority == PRIORITY_INTERACTIVE
+                    if self.leases is not None:
+                        result = await self._leased_attempt(
+                            host, username, login_credentials, flight.max_attempts, fail_fast
+                        )
+                    else:
+                        result = await self._attempt(host, username, login_credentials, flight.max_attempts, fail_fast)
+                except ScrapeFailed as e:
+                    self._failed += 1
+                    self._failure_reasons[e.reason] += 1
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                self._completed += 1
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.exception(f"Scheduler job for {username} raised")
+                self._failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _attempt(
+        self, host: str, username: str, login_credentials, max_attempts: int, fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            if fail_fast:
+                blocked = self.breaker.try_pass()
+                if blocked is not None:
+                    raise ScrapeFailed(username, FAILURE_CIRCUIT_OPEN, retry_after=blocked)
+            else:
+                await self.breaker.wait()
+            await self._bucket(host).acquire()
+            attempt += 1
+            self._in_flight += 1
+            try:
+                result = await self.scrape_fn(username, login_credentials)
+                self.breaker.record(True)
+                return result
+            except ProfileUnavailable as e:
+                # A clean answer from upstream, not an outage
+                self.breaker.record(True)
+                logger.info(f"{username} unavailable ({e.reason}); caching for {NEGATIVE_CACHE_TTL}s")
+                self._remember_missing(username, e.reason)
+                raise
+            except ScrapeFailed as e:
+                self.breaker.record(not e.retryable, e.retry_after)
+                # A fail-fast caller would rather pass Retry-After on than sleep through it
+                if not e.retryable or attempt >= max_attempts or (fail_fast and e.retry_after):
+                    logger.warning(f"Giving up on {username} after {attempt} attempt(s): {e.reason}")
+                    raise
+                delay, reason = backoff_delay(attempt, e.retry_after), e.reason
+            finally:
+                self._in_flight -= 1
+            self._retries += 1
+            logger.info(f"Retrying {username} in {delay:.1f}s (attempt {attempt} failed: {reason})")
+            await asyncio.sleep(delay)
+
+    async def _leased_attempt(
+        self, host: str, username: str, login_credentials, max_attempts: int, fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        """
+        _attempt under a per-username lease, so concurrent requests in other
+        processes wait for this one instead of calling upstream again.
+        """
+        key = f"scrape:{normalize_username(username)}"
+        while not await self.leases.acquire(key):
+            lease = await self.leases.peek(key)
+            payload = (lease or {}).get("payload")
+            if payload is None:
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                continue
+            self._shared_results += 1
+            if "unavailable" in payload:
+                self._remember_missing(username, payload["unavailable"])
+                raise ProfileUnavailable(username, payload["unavailable"])
+            return payload["result"]
+
+        payload, keep = None, 0
+        try:
+            async with self.leases.keepalive(key):
+                result = await self._attempt(host, username, login_credentials, max_attempts, fail_fast)
+            payload, keep = {"result": result}, SHARED_RESULT_TTL
+            return result
+        except ProfileUnavailable as e:
+            payload, keep = {"unavailable": e.reason}, NEGATIVE_CACHE_TTL
+            raise
+        finally:
+            # Other failures free the lease at once, so a waiting process can try itself
+            await self.leases.release(key, payload, keep)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate_per_second,
+            "effective_rate": {host: bucket.rate for host, bucket in self._buckets.items()},
+            "burst": self.burst,
+            "queue_depth": {name: self._queued[lane] for lane, name in LANE_NAMES.items()},
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "tokens_available": {host: bucket.available() for host, bucket in self._buckets.items()},
+            "unique_in_flight": len(self._flights),
+            "coalesced": self._coalesced,
+            "negative_cache_size": len(self._negative),
+            "negative_cache_hits": self._negative_hits,
+            "retries": self._retries,
+            "failure_reasons": dict(self._failure_reasons),
+            "circuit_breaker": self.breaker.stats(),
+            "coordinated": self.leases is not None,
+            "shared_rate_limit": self.shared_rate_limit,
+            "shared_results": self._shared_results,
+        }
+
+
+# Shared instance
+scrape_scheduler = ScrapeScheduler(
+    scrape_profile,
+    sessions=session_pool,
+    leases=lease_manager if COORDINATION_ENABLED else None,
+    shared_rate_limit=COORDINATION_ENABLED,
+)
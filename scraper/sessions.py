@@ -0,0 +1,277 @@
+# sessions.py (pool of Instagram sessionids shared by the scraper)
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+
+from database.mongo import sessions_collection, session_cooldowns_collection
+from scraper.coordination import COORDINATION_ENABLED
+
+logger = logging.getLogger(__name__)
+
+SESSION_FILE = "session.json"
+SESSION_THROTTLE_COOLDOWN = float(os.getenv("SESSION_THROTTLE_COOLDOWN", "300"))
+SESSION_AUTH_COOLDOWN = float(os.getenv("SESSION_AUTH_COOLDOWN", "1800"))
+SESSION_MAX_COOLDOWN = float(os.getenv("SESSION_MAX_COOLDOWN", "7200"))
+# Longest acquire() waits for a session to come off cool-down before giving up
+SESSION_ACQUIRE_WAIT = float(os.getenv("SESSION_ACQUIRE_WAIT", "5"))
+SESSION_FILE_CHECK_INTERVAL = 5.0
+# How often a coordinated pool picks up cool-downs reported by other processes
+SESSION_SYNC_INTERVAL = float(os.getenv("SESSION_SYNC_INTERVAL", "5"))
+# Weight of the latest outcome in the health score (exponential moving average)
+HEALTH_ALPHA = 0.2
+
+
+class Session:
+    __slots__ = ("sessionid", "account", "last_used", "cooldown_until", "strikes", "health", "requests", "throttled", "auth_failures", "last_status")
+
+    def __init__(self, sessionid: str, account: Optional[str] = None):
+        self.sessionid = sessionid
+        self.account = account
+        self.last_used = 0.0
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.health = 1.0
+        self.requests = 0
+        self.throttled = 0
+        self.auth_failures = 0
+        # Status that started the current cool-down (None if it came from another process)
+        self.last_status: Optional[int] = None
+
+    @property
+    def cookie(self) -> str:
+        return f"sessionid={self.sessionid}"
+
+    def available(self, now: float) -> bool:
+        return self.cooldown_until <= now
+
+    def describe(self, now: float) -> Dict[str, Any]:
+        return {
+            "account": self.account,
+            "sessionid": f"{self.sessionid[:6]}…" if self.sessionid else None,
+            "available": self.available(now),
+            "cooldown_seconds": max(0.0, round(self.cooldown_until - now, 1)),
+            "health": round(self.health, 3),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "auth_failures": self.auth_failures,
+        }
+
+
+class SessionsCoolingDown(Exception):
+    """Every session is on cool-down for longer than SESSION_ACQUIRE_WAIT."""
+
+    def __init__(self, retry_after: float, status_code: Optional[int] = None):
+        super().__init__(f"All sessions cooling down for {retry_after:.0f}s")
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+def read_session_file(path: str = SESSION_FILE) -> List[Dict[str, Any]]:
+    """
+    Reads sessions from the local file.
+
+    Accepts the original single-session shape {"sessionid": "..."} as well as
+    {"sessions": [{"sessionid": "...", "account": "..."}, ...]}.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "sessions" in data:
+        return [s for s in data["sessions"] if s.get("sessionid")]
+    if isinstance(data, dict) and data.get("sessionid"):
+        return [{"sessionid": data["sessionid"], "account": data.get("account")}]
+    return []
+
+
+def write_session_file(sessionid: str, account: Optional[str] = None, path: str = SESSION_FILE):
+    """Adds or replaces the session for `account` in the local file."""
+    sessions = [s for s in read_session_file(path) if account is None or s.get("account") != account]
+    sessions = [s for s in sessions if s["sessionid"] != sessionid]
+    sessions.append({"sessionid": sessionid, "account": account})
+    with open(path, "w") as f:
+        json.dump({"sessions": sessions}, f, indent=2)
+
+
+class SessionPool:
+    """
+    Rotates requests over every known sessionid.
+
+    Sessions come from session.json and the Mongo `sessions` collection. Each
+    request takes the available session with the best idle time weighted by
+    health, so recently throttled sessions are used less until they recover; a
+    429 or 401/403 puts that session on a cool-down that doubles with repeated strikes.
+    The pool reloads when the file changes or reload() is called.
+
+    With `shared`, cool-downs are also written to the `session_cooldowns`
+    collection and read back every SESSION_SYNC_INTERVAL seconds, so a session
+    throttled in one process is rested by all of them.
+    """
+
+    def __init__(self, path: str = SESSION_FILE, shared: bool = COORDINATION_ENABLED):
+        self.path = path
+        self.shared = shared
+        self._sessions: Dict[str, Session] = {}
+        self._file_mtime: Optional[float] = None
+        self._file_checked_at = 0.0
+        self._synced_at = 0.0
+        self._writes: set = set()
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def healthy_count(self) -> int:
+        now = time.monotonic()
+        return sum(1 for s in self._sessions.values() if s.available(now))
+
+    async def reload(self):
+        """Re-reads sessions from the file and Mongo, keeping stats of sessions that remain."""
+        entries = []
+        try:
+            entries.extend(read_session_file(self.path))
+            self._file_mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        except Exception:
+            logger.exception(f"Could not read {self.path}")
+        try:
+            async for doc in sessions_collection.find({"active": {"$ne": False}}, {"_id": 0, "sessionid": 1, "account": 1}):
+                entries.append(doc)
+        except Exception:
+            logger.exception("Could not load sessions from Mongo")
+
+        async with self._lock:
+            sessions = {}
+            for entry in entries:
+                sid = entry.get("sessionid")
+                if sid and sid not in sessions:
+                    sessions[sid] = self._sessions.get(sid) or Session(sid, entry.get("account"))
+            self._sessions = sessions
+        logger.info(f"Session pool loaded {len(sessions)} session(s)")
+
+    async def _maybe_reload_file(self):
+        now = time.monotonic()
+        if now - self._file_checked_at < SESSION_FILE_CHECK_INTERVAL:
+            return
+        self._file_checked_at = now
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        if mtime != self._file_mtime:
+            await self.reload()
+
+    async def _maybe_sync_cooldowns(self):
+        now = time.monotonic()
+        if not self.shared or now - self._synced_at < SESSION_SYNC_INTERVAL:
+            return
+        self._synced_at = now
+        wall = time.time()
+        try:
+            async for doc in session_cooldowns_collection.find({"cooldown_until": {"$gt": wall}}):
+                session = self._sessions.get(doc["_id"])
+                if session is not None:
+                    session.cooldown_until = max(session.cooldown_until, now + doc["cooldown_until"] - wall)
+        except Exception:
+            logger.exception("Could not read shared session cool-downs")
+
+    async def _share_cooldown(self, sessionid: str, cooldown: float):
+        until = time.time() + cooldown
+        try:
+            await session_cooldowns_collection.update_one(
+                {"_id": sessionid},
+                {"$max": {
+                    "cooldown_until": until,
+                    # TTL index removes the document once the cool-down is over
+                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=cooldown),
+                }},
+                upsert=True,
+            )
+        except Exception:
+            logger.exception("Could not share session cool-down")
+
+    async def acquire(self) -> Optional[Session]:
+        """
+        Picks the session to use for the next request.
+
+        Returns:
+            Session | None: None when no sessions are configured (anonymous request).
+
+        Raises:
+            SessionsCoolingDown: If no session becomes available within SESSION_ACQUIRE_WAIT.
+        """
+        await self._maybe_reload_file()
+        await self._maybe_sync_cooldowns()
+        while True:
+            async with self._lock:
+                if not self._sessions:
+                    return None
+                now = time.monotonic()
+                ready = [s for s in self._sessions.values() if s.available(now)]
+                if ready:
+                    # A session at half health needs twice the rest of a healthy one to be picked
+                    session = max(ready, key=lambda s: (now - s.last_used) * s.health)
+                    session.last_used = now
+                    session.requests += 1
+                    return session
+                soonest = min(self._sessions.values(), key=lambda s: s.cooldown_until)
+                wait = soonest.cooldown_until - now
+            if wait > SESSION_ACQUIRE_WAIT:
+                # Let the scheduler back off instead of parking the request for the whole cool-down
+                raise SessionsCoolingDown(wait, soonest.last_status)
+            logger.warning(f"All sessions cooling down; waiting {wait:.1f}s")
+            await asyncio.sleep(max(wait, 0.1))
+
+    def report(self, session: Optional[Session], status_code: int):
+        """Feeds an upstream response status back into the session's health."""
+        if session is None:
+            return
+        if status_code in (401, 403, 429):
+            base = SESSION_THROTTLE_COOLDOWN if status_code == 429 else SESSION_AUTH_COOLDOWN
+            cooldown = min(SESSION_MAX_COOLDOWN, base * (2 ** session.strikes))
+            session.strikes += 1
+            session.cooldown_until = time.monotonic() + cooldown
+            session.last_status = status_code
+            if status_code == 429:
+                session.throttled += 1
+            else:
+                session.auth_failures += 1
+            session.health = (1 - HEALTH_ALPHA) * session.health
+            if self.shared:
+                task = asyncio.get_running_loop().create_task(self._share_cooldown(session.sessionid, cooldown))
+                self._writes.add(task)
+                task.add_done_callback(self._writes.discard)
+            logger.warning(f"Session {session.account or session.sessionid[:6]} got {status_code}; cooling down {cooldown:.0f}s")
+        else:
+            session.strikes = 0
+            session.health = (1 - HEALTH_ALPHA) * session.health + HEALTH_ALPHA
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "total": len(self._sessions),
+            "available": self.healthy_count(),
+            "sessions": [s.describe(now) for s in self._sessions.values()],
+        }
+
+
+async def save_session(sessionid: str, account: Optional[str] = None):
+    """
+    Persists a (re)freshed session to the file and Mongo, then hot-reloads the pool.
+    """
+    write_session_file(sessionid, account)
+    try:
+        now = datetime.now(timezone.utc)
+        key = {"account": account} if account else {"sessionid": sessionid}
+        await sessions_collection.update_one(
+            key,
+            {"$set": {"sessionid": sessionid, "account": account, "active": True, "updated_at": now}},
+            upsert=True,
+        )
+    except Exception:
+        logger.exception("Could not store session in Mongo")
+    await session_pool.reload()
+
+
+# Shared instance
+session_pool = SessionPool()
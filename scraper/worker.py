@@ -1,34 +1,126 @@
 # worker.py (minimal version using only API)
 import httpx
 import re
-import json
 import os
 import logging
+import importlib.util
+import time
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
+from database.search import location_tokens
+from scraper.engagement import engagement_metrics
+from scraper.sessions import session_pool, SessionsCoolingDown
+from metrics import SCRAPE_SECONDS, SCRAPE_RESPONSES
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_sessionid():
-    path = "session.json"
-    if os.path.exists(path):
-        with open(path) as f:
-            data = json.load(f)
-            return data.get("sessionid")
+# === HTTP Client Tuning ===
+HTTP_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "15"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("SCRAPER_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SCRAPER_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("SCRAPER_HTTP2", "true").lower() in ("1", "true", "yes")
+# Point at a local stand-in (see bench/) to run without touching Instagram
+INSTAGRAM_API_BASE = os.getenv("INSTAGRAM_API_BASE", "https://i.instagram.com").rstrip("/")
+
+# === Failure Reasons ===
+FAILURE_RATE_LIMITED = "rate_limited"
+FAILURE_AUTH_EXPIRED = "auth_expired"
+FAILURE_NOT_FOUND = "not_found"
+FAILURE_MISSING = "missing"
+FAILURE_NETWORK = "network"
+FAILURE_UPSTREAM = "upstream_error"
+# Refused without calling upstream: the circuit breaker is open and the caller can't wait
+FAILURE_CIRCUIT_OPEN = "circuit_open"
+# Worth another attempt (possibly with a different session or after a pause)
+RETRYABLE_FAILURES = (FAILURE_RATE_LIMITED, FAILURE_AUTH_EXPIRED, FAILURE_NETWORK, FAILURE_UPSTREAM)
+
+class ScrapeFailed(Exception):
+    """A profile request failed; `reason` is one of the FAILURE_* values."""
+
+    def __init__(self, username: str, reason: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(f"{username}: {reason}" + (f" (HTTP {status_code})" if status_code else ""))
+        self.username = username
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.reason in RETRYABLE_FAILURES
+
+class ProfileUnavailable(ScrapeFailed):
+    """The profile does not exist (404) or came back without user data."""
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+def classify_response(username: str, response: httpx.Response) -> Optional[ScrapeFailed]:
+    """Maps an error status to a ScrapeFailed, or None for a usable response."""
+    status = response.status_code
+    if status == 404:
+        return ProfileUnavailable(username, FAILURE_NOT_FOUND, status)
+    if status == 429:
+        return ScrapeFailed(username, FAILURE_RATE_LIMITED, status, _retry_after(response))
+    if status in (401, 403):
+        return ScrapeFailed(username, FAILURE_AUTH_EXPIRED, status)
+    if status >= 400:
+        return ScrapeFailed(username, FAILURE_UPSTREAM, status, _retry_after(response))
     return None
 
 class InstagramScraper:
     def __init__(self):
-        sessionid = load_sessionid()
+        # The sessionid cookie is chosen per request from the session pool
         self.api_headers = {
             "x-ig-app-id": "936619743392459",
             "User-Agent": "Mozilla/5.0...",
             "Accept": "application/json",
         }
-        if sessionid:
-            self.api_headers["Cookie"] = f"sessionid={sessionid}"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = HTTP2_ENABLED
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("SCRAPER_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=limits,
+            http2=http2,
+            headers=self.api_headers,
+        )
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Returns the shared HTTP client, creating it on first use.
+
+        Returns:
+            httpx.AsyncClient: A pooled client reused across all profile requests.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self):
+        """Opens the shared HTTP client (called from the FastAPI lifespan)."""
+        _ = self.client
+
+    async def close(self):
+        """Closes the shared HTTP client and its pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
     @staticmethod
     def parse_follower_count(text):
@@ -45,33 +137,69 @@ class InstagramScraper:
         except:
             return 0
 
-    async def scrape_profile_api(self, username: str) -> Optional[Dict[str, Any]]:
-        url = f"https://i.instagram.com/api/v1/users/web_profile_info/?username={username}"
-        async with httpx.AsyncClient(timeout=15.0) as client:
+    async def scrape_profile_api(self, username: str) -> Dict[str, Any]:
+        url = f"{INSTAGRAM_API_BASE}/api/v1/users/web_profile_info/?username={username}"
+        try:
+            session = await session_pool.acquire()
+            headers = {"Cookie": session.cookie} if session else None
+            started = time.perf_counter()
             try:
-                response = await client.get(url, headers=self.api_headers)
-                response.raise_for_status()
-                user = response.json().get("data", {}).get("user", {})
-                if not user:
-                    logger.warning(f"No user data found for {username}")
-                    return None
-            
-                return {
-                    "username": user.get("username", username),
-                    "profile_url": f"https://www.instagram.com/{username}/",
-                    "profile_pic_url": user.get("profile_pic_url_hd") or user.get("profile_pic_url"),
-                    "follower_count": user.get("edge_followed_by", {}).get("count", 0),
-                    "following_count": user.get("edge_follow", {}).get("count", 0),
-                    "scraped_at": datetime.now(timezone.utc).isoformat(),
-                    "source": "api"
-                }
-
-            except Exception as e:
-                logger.error(f"Failed to scrape {username}: {e}")
-                return None
+                response = await self.client.get(url, headers=headers)
+            except httpx.TransportError:
+                SCRAPE_SECONDS.labels("error").observe(time.perf_counter() - started)
+                SCRAPE_RESPONSES.labels("error").inc()
+                raise
+            SCRAPE_SECONDS.labels("ok" if response.is_success else "http_error").observe(time.perf_counter() - started)
+            SCRAPE_RESPONSES.labels(str(response.status_code)).inc()
+            session_pool.report(session, response.status_code)
+            failure = classify_response(username, response)
+            if failure:
+                raise failure
+            user = (response.json().get("data") or {}).get("user") or {}
+            if not user:
+                logger.warning(f"No user data found for {username}")
+                raise ProfileUnavailable(username, FAILURE_MISSING)
+
+            bio = user.get("biography")
+            follower_count = user.get("edge_followed_by", {}).get("count", 0)
+            return {
+                "username": user.get("username", username),
+                "profile_url": f"https://www.instagram.com/{username}/",
+                "profile_pic_url": user.get("profile_pic_url_hd") or user.get("profile_pic_url"),
+                "bio": bio,
+                "location_tokens": location_tokens(bio),
+                "follower_count": follower_count,
+                "following_count": user.get("edge_follow", {}).get("count", 0),
+                # Recent posts ride along in the same payload
+                **engagement_metrics(user, follower_count),
+                "scraped_at": datetime.now(timezone.utc),
+                "source": "api"
+            }
+
+        except ScrapeFailed:
+            raise
+        except SessionsCoolingDown as e:
+            reason = FAILURE_AUTH_EXPIRED if e.status_code in (401, 403) else FAILURE_RATE_LIMITED
+            raise ScrapeFailed(username, reason, retry_after=e.retry_after) from e
+        except httpx.TransportError as e:
+            # Timeouts, resets, DNS: nothing wrong with the session or the profile
+            raise ScrapeFailed(username, FAILURE_NETWORK) from e
+        except Exception as e:
+            logger.error(f"Failed to scrape {username}: {e}")
+            raise ScrapeFailed(username, FAILURE_UPSTREAM) from e
 
 # Shared instance
 instagram_scraper = InstagramScraper()
 
-async def scrape_profile(username: str, login_credentials: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+async def scrape_profile(username: str, login_credentials: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Scrapes one profile through the shared scraper (a single attempt; retries live in the scheduler).
+
+    Returns:
+        dict: Profile fields.
+
+    Raises:
+        ProfileUnavailable: If the profile does not exist.
+        ScrapeFailed: For any other failure, classified by `reason`.
+    """
     return await instagram_scraper.scrape_profile_api(username)
@@ -1,28 +1,112 @@
 # session_manager.py
+import asyncio
+import logging
 import os
-import json
-from playwright.async_api import async_playwright
+from typing import Optional
 
-SESSION_FILE = "session.json"
+from scraper.sessions import save_session
 
-async def refresh_instagram_session(username, password):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        await page.goto("https://www.instagram.com/accounts/login/")
-        await page.fill("input[name='username']", username)
-        await page.fill("input[name='password']", password)
+logger = logging.getLogger(__name__)
+
+LOGIN_URL = "https://www.instagram.com/accounts/login/"
+# Max concurrent logins, each in its own browser context
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+LOGIN_TIMEOUT_MS = int(os.getenv("LOGIN_TIMEOUT_MS", "30000"))
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium shared by every session refresh.
+
+    Playwright is imported and Chromium launched on first use, then kept until
+    close(); processes that never refresh a session pay for neither. Each login
+    runs in a fresh browser context, so cookies never leak between accounts,
+    and at most `size` logins run at once.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = max(1, size)
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                logger.info("Launched shared Chromium for session refreshes")
+            return self._browser
+
+    async def close(self):
+        """Closes the shared browser and Playwright driver (called from the FastAPI lifespan)."""
+        async with self._launch_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def login(self, username: str, password: str, timeout_ms: int = LOGIN_TIMEOUT_MS) -> Optional[str]:
+        """
+        Logs in with a fresh context and returns the sessionid cookie.
+
+        Returns:
+            str | None: The sessionid, or None if login did not complete in time.
+        """
+        async with self._slots:
+            browser = await self._get_browser()
+            context = await browser.new_context()
+            try:
+                page = await context.new_page()
+                await page.goto(LOGIN_URL)
+                await page.fill("input[name='username']", username)
+                await page.fill("input[name='password']", password)
+                await _submit_and_wait(page, timeout_ms)
+                cookies = await context.cookies()
+                return next((c["value"] for c in cookies if c["name"] == "sessionid"), None)
+            finally:
+                await context.close()
+
+
+async def _submit_and_wait(page, timeout_ms: int):
+    """
+    Submits the login form and returns as soon as the login request answers or
+    the page leaves the login form, whichever happens first.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    # Listen before clicking so a fast response is not missed
+    waiters = [
+        asyncio.ensure_future(page.wait_for_response(lambda r: "/accounts/login/ajax" in r.url, timeout=timeout_ms)),
+        asyncio.ensure_future(page.wait_for_url(lambda url: "/accounts/login" not in url, timeout=timeout_ms)),
+    ]
+    try:
+        await asyncio.sleep(0)
         await page.click("button[type='submit']")
-        await page.wait_for_timeout(5000)
+        done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            try:
+                task.result()
+            except PlaywrightTimeoutError:
+                logger.warning("Timed out waiting for Instagram login to complete")
+    finally:
+        for task in waiters:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
 
-        cookies = await context.cookies()
-        sessionid = next((c["value"] for c in cookies if c["name"] == "sessionid"), None)
+# Shared instance
+browser_pool = BrowserPool()
 
-        if sessionid:
-            with open(SESSION_FILE, "w") as f:
-                json.dump({"sessionid": sessionid}, f)
 
-        await browser.close()
-        return sessionid
+async def refresh_instagram_session(username, password):
+    sessionid = await browser_pool.login(username, password)
+    if sessionid:
+        # Adds the account to the session pool (file + Mongo) and hot-reloads it
+        await save_session(sessionid, username)
+    return sessionid
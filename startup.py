@@ -0,0 +1,157 @@
+# startup.py (cold-start profile and component readiness for /health)
+"""
+Times each startup phase and tracks which components are ready.
+
+    python -m startup                          # slowest modules behind `import main`
+    python -m startup --top 30 --max-seconds 1.5   # exits 1 when imports exceed the budget (CI)
+
+The import report runs `python -X importtime -c "import main"` in a fresh
+interpreter, so it measures a real cold import rather than this process.
+"""
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import STARTUP_PHASE_SECONDS
+
+STATUS_STARTING = "starting"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+class StartupProfile:
+    """
+    Phase durations and readiness, filled in by main.py while it imports and
+    while the lifespan starts each component.
+
+    A component marked required keeps /health unready until it is up; an
+    optional one only degrades it.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.complete = False
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = round(seconds, 4)
+        STARTUP_PHASE_SECONDS.labels(phase).set(seconds)
+
+    @asynccontextmanager
+    async def phase(self, name: str, required: bool = True):
+        """
+        Times the enclosed block and records the component's status.
+
+        Args:
+            name (str): Phase and component name.
+            required (bool): Whether /health stays unready if it fails.
+
+        Raises:
+            Whatever the block raises, after marking the component failed.
+        """
+        component = {"status": STATUS_STARTING, "required": required}
+        self.components[name] = component
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            component["status"] = STATUS_FAILED
+            component["error"] = str(e) or type(e).__name__
+            raise
+        else:
+            component["status"] = STATUS_READY
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def skip(self, name: str, reason: str, required: bool = True):
+        self.components[name] = {"status": STATUS_FAILED, "required": required, "error": reason}
+
+    def finish(self):
+        self.complete = True
+
+    def health(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Returns:
+            tuple: (ready, body) where body has an overall status of "ok",
+            "degraded" (an optional component failed), "starting" or "unavailable".
+        """
+        failed_required = [n for n, c in self.components.items() if c["required"] and c["status"] != STATUS_READY]
+        failed_optional = [n for n, c in self.components.items() if not c["required"] and c["status"] == STATUS_FAILED]
+        if not self.complete:
+            status = STATUS_STARTING
+        elif failed_required:
+            status = "unavailable"
+        elif failed_optional:
+            status = "degraded"
+        else:
+            status = "ok"
+        ready = status in ("ok", "degraded")
+        return ready, {"status": status, "components": self.components}
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "complete": self.complete,
+            "phases": self.phases,
+            "total_seconds": round(sum(self.phases.values()), 4),
+        }
+
+
+# Shared instance
+startup_profile = StartupProfile()
+
+
+# === Import-time report ===
+def import_times(module: str = "main") -> List[Tuple[str, float, float]]:
+    """
+    Imports `module` in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        list: (module, self seconds, cumulative seconds), slowest cumulative first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # header line
+        rows.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+def format_import_times(rows: List[Tuple[str, float, float]], top: int) -> str:
+    lines = [f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}"]
+    for name, own, cumulative in rows[:top]:
+        lines.append(f"{name[:50]:<50} {own * 1000:>9.1f} {cumulative * 1000:>14.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report import time of the API entry point")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--max-seconds", type=float, help="Exit 1 when the total import time exceeds this")
+    args = parser.parse_args(argv)
+
+    rows = import_times(args.module)
+    total = next((cumulative for name, _, cumulative in rows if name == args.module), 0.0)
+    print(format_import_times(rows, args.top))
+    print(f"\nimport {args.module}: {total:.3f}s")
+    if args.max_seconds is not None and total > args.max_seconds:
+        print(f"Import time exceeds the {args.max_seconds:.3f}s budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
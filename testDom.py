@@ -1,19 +1,22 @@
 import asyncio
 import logging
-from scraper.worker import InstagramScraper
+from scraper.worker import InstagramScraper, ScrapeFailed
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
 async def main():
+    # To run offline: python -m bench.fake_instagram, then set INSTAGRAM_API_BASE as it prints
     scraper = InstagramScraper()
     username = "therock"  # or "virat.kohli" etc.
-    result = await scraper.scrape_profile_dom(username, login_credentials=None)
-    if result:
+    try:
+        result = await scraper.scrape_profile_api(username)
         print("Scraped data keys:", result.keys())
-        print("Sample:", {k: result[k] for k in ("username", "name", "follower_count", "bio")})
-    else:
-        print("Failed to scrape DOM for", username)
+        print("Sample:", {k: result[k] for k in ("username", "follower_count", "following_count", "bio")})
+    except ScrapeFailed as e:
+        print(f"Failed to scrape {username}: {e.reason}")
+    finally:
+        await scraper.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from api.ingest import parse_count, parse_count_series
+
+VALUES = [
+    None, float("nan"), "", "abc", "1200", "1,200", " 1.2K ", "3 m followers", "2b", "~500", ".5k",
+    "10-20", "10–20", "10—20k", "-5", "1.2.3k", "1-a", 4500.0, 17,
+    # Past int64: must read as 0 on both paths instead of wrapping around
+    "99999999999999999999", "9223372036854775808", "9223372036854775807", "9999999999b",
+    "99999999999999999999-1", "1e999-1",
+]
+
+
+def test_parse_count_series_matches_parse_count():
+    series = pd.Series(VALUES + VALUES[::-1], dtype=object)
+    expected = []
+    for value in series:
+        try:
+            expected.append(parse_count(value))
+        except ValueError:
+            expected.append(0)
+    assert parse_count_series(series).tolist() == expected
+
+
+def test_parse_count_overflow_reads_as_zero():
+    assert parse_count("99999999999999999999") == 0
+    assert parse_count_series(pd.Series(["99999999999999999999"])).tolist() == [0]
@@ -0,0 +1,58 @@
+import pytest
+
+from api.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_filter
+
+mongomock = pytest.importorskip("mongomock")
+
+# Ties on 100, an explicit null and a missing field: the cases keyset_filter branches on
+DOCS = [
+    {"username": "a", "follower_count": 100},
+    {"username": "b", "follower_count": None},
+    {"username": "c", "follower_count": 300},
+    {"username": "d"},
+    {"username": "e", "follower_count": 100},
+    {"username": "f", "follower_count": 5},
+    {"username": "g", "follower_count": None},
+    {"username": "h", "follower_count": 100},
+]
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().db.creators
+    collection.insert_many([dict(doc) for doc in DOCS])
+    return collection
+
+
+def _walk(collection, order, limit):
+    direction = -1 if order == "desc" else 1
+    sort = [("follower_count", direction), ("username", direction)]
+    usernames, token = [], None
+    while True:
+        cursor = decode_cursor(token, "follower_count", order) if token else None
+        page = list(collection.find(keyset_filter("follower_count", order, cursor) or {}).sort(sort).limit(limit))
+        usernames.extend(doc["username"] for doc in page)
+        if len(page) < limit:
+            return usernames
+        token = encode_cursor("follower_count", order, page[-1])
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", [1, 2, 3, 8])
+def test_pages_cover_every_document_once(collection, order, limit):
+    direction = -1 if order == "desc" else 1
+    expected = [doc["username"] for doc in collection.find().sort([("follower_count", direction), ("username", direction)])]
+    assert _walk(collection, order, limit) == expected
+
+
+def test_cursor_round_trip():
+    token = encode_cursor("follower_count", "desc", {"username": "d"})
+    assert decode_cursor(token, "follower_count", "desc") == {"s": "follower_count", "o": "desc", "v": None, "u": "d"}
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    token = encode_cursor("follower_count", "desc", {"username": "a", "follower_count": 1})
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "follower_count", "asc")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "follower_count", "desc")
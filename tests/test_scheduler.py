@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+import scraper.scheduler as scheduler_module
+from scraper.scheduler import PRIORITY_INTERACTIVE, ScrapeScheduler
+from scraper.worker import (
+    FAILURE_CIRCUIT_OPEN, FAILURE_NETWORK, FAILURE_NOT_FOUND, ProfileUnavailable, ScrapeFailed,
+)
+
+
+class FakeUpstream:
+    """scrape_fn that records every call; "ghost*" profiles do not exist, "flaky" always times out."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, username, login_credentials=None):
+        self.calls.append(username)
+        await asyncio.sleep(0.01)
+        if username.startswith("ghost"):
+            raise ProfileUnavailable(username, FAILURE_NOT_FOUND)
+        if username == "flaky":
+            raise ScrapeFailed(username, FAILURE_NETWORK)
+        return {"username": username, "follower_count": 100}
+
+
+def run(coro_fn):
+    async def main():
+        upstream = FakeUpstream()
+        scheduler = ScrapeScheduler(upstream, max_concurrency=2, rate_per_second=1000, burst=1000)
+        try:
+            return await coro_fn(scheduler, upstream)
+        finally:
+            await scheduler.close()
+    return asyncio.run(main())
+
+
+def test_spellings_of_one_username_share_one_upstream_call():
+    async def scenario(scheduler, upstream):
+        first, second = await asyncio.gather(scheduler.submit("@NASA"), scheduler.submit(" nasa"))
+        assert upstream.calls == ["nasa"]
+        assert first == second == {"username": "nasa", "follower_count": 100}
+        # Each caller gets its own dict
+        first["fields"] = 1
+        assert "fields" not in second
+    run(scenario)
+
+
+def test_missing_profile_is_answered_from_the_negative_cache():
+    async def scenario(scheduler, upstream):
+        with pytest.raises(ProfileUnavailable):
+            await scheduler.submit("@Ghost")
+        with pytest.raises(ProfileUnavailable):
+            await scheduler.submit("ghost")
+        assert upstream.calls == ["ghost"]
+        # An existing profile is not affected by another name's entry
+        assert (await scheduler.submit("@nasa"))["username"] == "nasa"
+    run(scenario)
+
+
+def test_negative_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "NEGATIVE_CACHE_MAX", 3)
+
+    async def scenario(scheduler, upstream):
+        for i in range(10):
+            with pytest.raises(ProfileUnavailable):
+                await scheduler.submit(f"ghost{i}")
+        assert list(scheduler._negative) == ["ghost7", "ghost8", "ghost9"]
+    run(scenario)
+
+
+def test_max_attempts_limits_upstream_calls():
+    async def scenario(scheduler, upstream):
+        with pytest.raises(ScrapeFailed):
+            await scheduler.submit("flaky", max_attempts=1)
+        assert upstream.calls == ["flaky"]
+    run(scenario)
+
+
+def test_interactive_scrapes_fail_fast_while_the_breaker_is_open():
+    async def scenario(scheduler, upstream):
+        scheduler.breaker._open(time.monotonic(), retry_after=120)
+        with pytest.raises(ScrapeFailed) as failure:
+            await asyncio.wait_for(scheduler.submit("nasa", priority=PRIORITY_INTERACTIVE), timeout=1)
+        assert failure.value.reason == FAILURE_CIRCUIT_OPEN
+        assert 100 < failure.value.retry_after <= 120
+        assert upstream.calls == []
+    run(scenario)
+
+
+def test_interactive_scrapes_retry_less(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "SCRAPE_BACKOFF_MAX", 0.01)
+
+    async def scenario(scheduler, upstream):
+        with pytest.raises(ScrapeFailed):
+            await scheduler.submit("flaky", priority=PRIORITY_INTERACTIVE)
+        assert len(upstream.calls) == scheduler_module.SCRAPE_INTERACTIVE_ATTEMPTS < scheduler.max_attempts
+    run(scenario)